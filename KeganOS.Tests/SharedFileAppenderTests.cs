@@ -0,0 +1,116 @@
+using KeganOS.Infrastructure.Services;
+using System;
+using System.Collections.Generic;
+using System.Diagnostics;
+using System.IO;
+using System.Linq;
+using System.Threading.Tasks;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace KeganOS.Tests;
+
+/// <summary>
+/// Tests for the append protocol shared with KEGOMODORO (time.csv / journey file)
+/// </summary>
+public class SharedFileAppenderTests : IDisposable
+{
+    private readonly string _directory;
+    private readonly string _path;
+    private readonly ITestOutputHelper _output;
+
+    public SharedFileAppenderTests(ITestOutputHelper output)
+    {
+        _output = output;
+        _directory = Path.Combine(Path.GetTempPath(), "KeganOS.Tests", Guid.NewGuid().ToString("N"));
+        Directory.CreateDirectory(_directory);
+        _path = Path.Combine(_directory, "time.csv");
+    }
+
+    public void Dispose()
+    {
+        Directory.Delete(_directory, recursive: true);
+    }
+
+    [Fact]
+    public void AppendRecord_AfterUnterminatedRow_StartsOnNewLine()
+    {
+        // Arrange - legacy writers left the last row without a newline
+        File.WriteAllText(_path, "hours,minute,second\n0,25,0");
+
+        // Act
+        SharedFileAppender.AppendRecord(_path, "1,2,3");
+
+        // Assert
+        Assert.Equal("hours,minute,second\n0,25,0\n1,2,3\n", File.ReadAllText(_path));
+        Assert.False(File.Exists(_path + ".lock"));
+    }
+
+    [Fact]
+    public void AppendRecord_WithoutTerminate_WritesRecordAsIs()
+    {
+        // Arrange
+        File.WriteAllText(_path, "\n\n12/21/2025\n01:00:00");
+
+        // Act
+        SharedFileAppender.AppendRecord(_path, "\n\n12/22/2025\n00:25:00 note", terminate: false);
+
+        // Assert
+        Assert.Equal("\n\n12/21/2025\n01:00:00\n\n12/22/2025\n00:25:00 note", File.ReadAllText(_path));
+    }
+
+    [Fact]
+    public void WithLock_IsReentrantOnSameThread()
+    {
+        // Act
+        SharedFileAppender.WithLock(_path, () => SharedFileAppender.AppendRecord(_path, "0,0,1"));
+
+        // Assert
+        Assert.Equal("0,0,1\n", File.ReadAllText(_path));
+    }
+
+    [Fact]
+    public void ReplaceContent_ReplacesFileAndLeavesNoTempFile()
+    {
+        // Arrange
+        File.WriteAllText(_path, "\n\n12/21/2025\n01:00:00");
+
+        // Act
+        SharedFileAppender.WithLock(_path, () => SharedFileAppender.ReplaceContent(_path, "\n\n12/21/2025\n02:00:00 merged"));
+
+        // Assert
+        Assert.Equal("\n\n12/21/2025\n02:00:00 merged", File.ReadAllText(_path));
+        Assert.Equal(new[] { _path }, Directory.GetFiles(_directory));
+    }
+
+    [Fact]
+    public async Task AppendRecord_ConcurrentWriters_LoseAndCorruptNothing()
+    {
+        // Arrange
+        const int writers = 8;
+        const int records = 500;
+        var stopwatch = Stopwatch.StartNew();
+
+        // Act
+        await Task.WhenAll(Enumerable.Range(0, writers).Select(writer => Task.Run(() =>
+        {
+            for (var index = 0; index < records; index++)
+                SharedFileAppender.AppendRecord(_path, $"{writer},{index},{new string('x', index % 50)}");
+        })));
+        stopwatch.Stop();
+
+        // Assert
+        var text = File.ReadAllText(_path);
+        Assert.EndsWith("\n", text);
+        var seen = new HashSet<(int, int)>();
+        foreach (var line in text.Split('\n', StringSplitOptions.RemoveEmptyEntries))
+        {
+            var parts = line.Split(',');
+            Assert.Equal(3, parts.Length);
+            Assert.Equal(int.Parse(parts[1]) % 50, parts[2].Length);
+            Assert.True(seen.Add((int.Parse(parts[0]), int.Parse(parts[1]))), $"Duplicate row {line}");
+        }
+        Assert.Equal(writers * records, seen.Count);
+        _output.WriteLine($"{writers * records / stopwatch.Elapsed.TotalSeconds:F0} records/s");
+    }
+}
@@ -137,7 +137,8 @@ public class JournalService : IJournalService
             
             var entry = $"\n\n{date}\n{time} {note}";
             
-            await File.AppendAllTextAsync(filePath, entry);
+            // Same lock and single append as KEGOMODORO (see SharedFileAppender)
+            await Task.Run(() => SharedFileAppender.AppendRecord(filePath, entry, terminate: false));
             _logger.Information("Entry appended successfully");
         }
         catch (Exception ex)
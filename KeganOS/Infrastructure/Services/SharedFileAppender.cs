@@ -0,0 +1,192 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Text;
+using System.Threading;
+using Serilog;
+
+namespace KeganOS.Infrastructure.Services;
+
+/// <summary>
+/// Append protocol shared with KEGOMODORO (kegomodoro/shared_append.py) for time.csv and the journey file.
+/// Writers take the advisory "&lt;file&gt;.lock" (created exclusively, holding "pid token"), make sure the file
+/// ends with a newline when appending rows, and write each complete record with a single append.
+/// A stale lock is moved aside before it is deleted, and only deleted if the moved file itself is stale;
+/// a lock is only released by the writer whose token it holds.
+/// </summary>
+public static class SharedFileAppender
+{
+    private static readonly ILogger _logger = Log.ForContext(typeof(SharedFileAppender));
+    private const string LockSuffix = ".lock";
+    private static readonly TimeSpan LockTimeout = TimeSpan.FromMilliseconds(500);
+    private static readonly TimeSpan RetryInterval = TimeSpan.FromMilliseconds(5);
+    private static readonly TimeSpan StaleLockAge = TimeSpan.FromSeconds(5);
+
+    // Locks this thread already holds (lock path -> token), so AppendRecord can be called inside WithLock
+    [ThreadStatic] private static Dictionary<string, string>? _heldLocks;
+
+    /// <summary>
+    /// Append one complete record. With terminate=true (time.csv rows) the record ends with a newline
+    /// and gets a leading one if the previous row was left unterminated.
+    /// </summary>
+    public static void AppendRecord(string path, string record, bool terminate = true)
+    {
+        if (terminate && !record.EndsWith('\n'))
+            record += "\n";
+
+        WithLock(path, () =>
+        {
+            if (terminate && !EndsWithNewline(path))
+                record = "\n" + record;
+
+            // Append mode: the write always lands at the end, even next to another process' append
+            var bytes = new UTF8Encoding(false).GetBytes(record);
+            using var stream = new FileStream(path, FileMode.Append, FileAccess.Write, FileShare.ReadWrite);
+            stream.Write(bytes, 0, bytes.Length);
+            stream.Flush();
+        });
+    }
+
+    /// <summary>
+    /// Replace the whole file (e.g. after merging into the journey file). Call it inside WithLock: the new content
+    /// goes to a temp file that is then moved over the original, so unlocked readers never see a half-written file.
+    /// </summary>
+    public static void ReplaceContent(string path, string content)
+    {
+        var tempPath = $"{path}.{Guid.NewGuid():N}.tmp";
+        try
+        {
+            File.WriteAllText(tempPath, content, new UTF8Encoding(false));
+            File.Move(tempPath, path, overwrite: true);
+        }
+        finally
+        {
+            if (File.Exists(tempPath))
+                File.Delete(tempPath);
+        }
+    }
+
+    private static bool EndsWithNewline(string path)
+    {
+        if (!File.Exists(path))
+            return true;
+        using var reader = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.ReadWrite | FileShare.Delete);
+        if (reader.Length == 0)
+            return true;
+        reader.Seek(-1, SeekOrigin.End);
+        return reader.ReadByte() == '\n';
+    }
+
+    /// <summary>
+    /// Run an action while holding the file's lock (e.g. rewriting the journey file).
+    /// If the lock can't be taken in time the action still runs so no data is dropped.
+    /// </summary>
+    public static void WithLock(string path, Action action)
+    {
+        var lockPath = Path.GetFullPath(path) + LockSuffix;
+        _heldLocks ??= new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+        if (_heldLocks.ContainsKey(lockPath))
+        {
+            action();
+            return;
+        }
+
+        var token = $"{Environment.ProcessId} {Guid.NewGuid():N}";
+        var acquired = TryAcquire(lockPath, token);
+        if (acquired)
+            _heldLocks[lockPath] = token;
+        else
+            _logger.Warning("Could not lock {Path} within {Timeout}, writing anyway", lockPath, LockTimeout);
+        try
+        {
+            action();
+        }
+        finally
+        {
+            if (acquired)
+            {
+                _heldLocks.Remove(lockPath);
+                if (ReadLock(lockPath) == token)
+                {
+                    try { File.Delete(lockPath); }
+                    catch (IOException) { }
+                }
+            }
+        }
+    }
+
+    private static bool TryAcquire(string lockPath, string token)
+    {
+        var deadline = DateTime.UtcNow + LockTimeout;
+        while (true)
+        {
+            try
+            {
+                using var stream = new FileStream(lockPath, FileMode.CreateNew, FileAccess.Write, FileShare.None);
+                var content = Encoding.ASCII.GetBytes(token);
+                stream.Write(content, 0, content.Length);
+                return true;
+            }
+            catch (IOException)
+            {
+                BreakIfStale(lockPath);
+            }
+            catch (UnauthorizedAccessException)
+            {
+                // Lock file is being deleted by the other writer
+            }
+
+            if (DateTime.UtcNow >= deadline)
+                return false;
+            Thread.Sleep(RetryInterval);
+        }
+    }
+
+    private static string? ReadLock(string path)
+    {
+        try
+        {
+            using var stream = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.ReadWrite | FileShare.Delete);
+            using var reader = new StreamReader(stream, Encoding.ASCII);
+            return reader.ReadToEnd();
+        }
+        catch (IOException) { return null; }
+        catch (UnauthorizedAccessException) { return null; }
+    }
+
+    private static bool IsStale(string path) =>
+        File.Exists(path) && DateTime.UtcNow - File.GetLastWriteTimeUtc(path) > StaleLockAge;
+
+    private static void BreakIfStale(string lockPath)
+    {
+        var aside = $"{lockPath}.{Guid.NewGuid():N}.stale";
+        try
+        {
+            if (!IsStale(lockPath))
+                return;
+            // Atomic: only one waiter gets hold of the lock file
+            File.Move(lockPath, aside);
+        }
+        catch (IOException) { return; }
+        catch (UnauthorizedAccessException) { return; }
+
+        try
+        {
+            // The lock may have been replaced since the check above; a move keeps the write time, so judge this file
+            if (IsStale(aside))
+            {
+                File.Delete(aside);
+                _logger.Warning("Removed stale lock {Path}", lockPath);
+                return;
+            }
+
+            // Another waiter broke it first and this is its fresh lock: hand it back
+            if (!File.Exists(lockPath))
+                File.Move(aside, lockPath);
+            else
+                File.Delete(aside);
+        }
+        catch (IOException) { }
+        catch (UnauthorizedAccessException) { }
+    }
+}
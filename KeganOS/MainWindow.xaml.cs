@@ -438,7 +438,7 @@ public partial class MainWindow : System.Windows.Window
             }
             BestStreakText.Text = $"{_currentUser.BestStreak} days";
 
-            // Load Pixe.la heatmap if configured
+            // Load the heatmap (local first, then Pixe.la if configured)
             await LoadPixelaHeatmapAsync();
             
             // Load ticker quotes
@@ -571,37 +571,66 @@ public partial class MainWindow : System.Windows.Window
 
     private async System.Threading.Tasks.Task LoadPixelaHeatmapAsync()
     {
-        if (_currentUser == null || !_pixelaService.IsConfigured(_currentUser))
-        {
-            PixelaStatus.Text = "Pixe.la not configured";
-            return;
-        }
-
+        var configured = _currentUser != null && _pixelaService.IsConfigured(_currentUser);
         try
         {
-            _logger.Information("Loading Pixe.la heatmap for {User}", _currentUser.PixelaUsername);
-            PixelaStatus.Text = "Loading...";
+            // 1. Show the heatmap KEGOMODORO renders from the local journal right away, Pixe.la or not
+            var local = LoadLocalHeatmapSvg();
+            if (!string.IsNullOrEmpty(local))
+            {
+                await ShowHeatmapAsync(local, "");
+                PixelaStatus.Text = configured ? "📊 Local heatmap • Syncing with Pixe.la..." : "📊 Local heatmap";
+            }
+
+            if (!configured)
+            {
+                if (string.IsNullOrEmpty(local))
+                    PixelaStatus.Text = "Pixe.la not configured";
+                return;
+            }
+
+            _logger.Information("Loading Pixe.la heatmap for {User}", _currentUser!.PixelaUsername);
+            if (string.IsNullOrEmpty(local))
+                PixelaStatus.Text = "Loading...";
             
-            // 1. Find the latest NON-ZERO activity date to ensure we show "greens" 
+            // 2. Find the latest NON-ZERO activity date to ensure we show "greens" 
             // instead of just today's (empty) dashboard view.
             var latestDate = await _pixelaService.GetLatestActiveDateAsync(_currentUser);
             
-            // 2. Fetch the SVG with that date as the anchor and DARK appearance
+            // 3. Fetch the SVG with that date as the anchor and DARK appearance
             var svg = await _pixelaService.GetSvgAsync(_currentUser, latestDate, "dark");
             
             if (string.IsNullOrEmpty(svg))
             {
-                PixelaStatus.Text = "Could not fetch heatmap";
+                // Offline or rate limited: keep the local heatmap
+                PixelaStatus.Text = string.IsNullOrEmpty(local) ? "Could not fetch heatmap" : "📊 Local heatmap (offline)";
                 return;
             }
 
-            // Cleanup SVG string: remove XML declaration and DOCTYPE
-            svg = Regex.Replace(svg, @"<\?xml.*?\?>", "", RegexOptions.IgnoreCase | RegexOptions.Singleline);
-            svg = Regex.Replace(svg, @"<!DOCTYPE.*?>", "", RegexOptions.IgnoreCase | RegexOptions.Singleline);
-
             var graphUrl = $"https://pixe.la/v1/users/{_currentUser.PixelaUsername}/graphs/{_currentUser.PixelaGraphId}.html";
+            await ShowHeatmapAsync(svg, graphUrl);
+            
+            PixelaStatus.Text = $"📊 {_currentUser.PixelaUsername}/{_currentUser.PixelaGraphId} • Click pixel to edit";
             
-            var html = $@"
+            _logger.Information("Pixe.la heatmap (anchor: {Date}) rendered with WebView2", latestDate ?? "today");
+        }
+        catch (System.Exception ex)
+        {
+            _logger.Warning(ex, "Failed to load Pixe.la heatmap");
+            PixelaStatus.Text = "Could not load heatmap";
+        }
+    }
+
+    /// <summary>
+    /// Render a heatmap SVG in the WebView; clicking outside a pixel opens graphUrl (if any)
+    /// </summary>
+    private async System.Threading.Tasks.Task ShowHeatmapAsync(string svg, string graphUrl)
+    {
+        // Cleanup SVG string: remove XML declaration and DOCTYPE
+        svg = Regex.Replace(svg, @"<\?xml.*?\?>", "", RegexOptions.IgnoreCase | RegexOptions.Singleline);
+        svg = Regex.Replace(svg, @"<!DOCTYPE.*?>", "", RegexOptions.IgnoreCase | RegexOptions.Singleline);
+
+        var html = $@"
 <!DOCTYPE html>
 <html>
 <head>
@@ -669,7 +698,7 @@ public partial class MainWindow : System.Windows.Window
         }});
 
         document.body.addEventListener('click', function(e) {{
-            if (!pixelClicked) {{
+            if (!pixelClicked && '{graphUrl}') {{
                 window.open('{graphUrl}', '_blank');
             }}
             pixelClicked = false;
@@ -677,25 +706,44 @@ public partial class MainWindow : System.Windows.Window
     </script>
 </body>
 </html>";
-            
-            // Ensure WebView2 is initialized before navigating
-            await PixelaHeatmapWebView.EnsureCoreWebView2Async();
-            
-            // Unsubscribe and subscribe to prevent duplicate handlers
-            PixelaHeatmapWebView.WebMessageReceived -= PixelaHeatmapWebView_WebMessageReceived;
-            PixelaHeatmapWebView.WebMessageReceived += PixelaHeatmapWebView_WebMessageReceived;
-            
-            PixelaHeatmapWebView.NavigateToString(html);
-            
-            PixelaStatus.Text = $"📊 {_currentUser.PixelaUsername}/{_currentUser.PixelaGraphId} • Click pixel to edit";
-            
-            _logger.Information("Pixe.la heatmap (anchor: {Date}) rendered with WebView2", latestDate ?? "today");
-        }
-        catch (System.Exception ex)
+        
+        // Ensure WebView2 is initialized before navigating
+        await PixelaHeatmapWebView.EnsureCoreWebView2Async();
+        
+        // Unsubscribe and subscribe to prevent duplicate handlers
+        PixelaHeatmapWebView.WebMessageReceived -= PixelaHeatmapWebView_WebMessageReceived;
+        PixelaHeatmapWebView.WebMessageReceived += PixelaHeatmapWebView_WebMessageReceived;
+        
+        PixelaHeatmapWebView.NavigateToString(html);
+    }
+
+    /// <summary>
+    /// Read the heatmap KEGOMODORO renders locally (kegomodoro/dependencies/heatmap), empty if there is none
+    /// </summary>
+    private string LoadLocalHeatmapSvg()
+    {
+        var possiblePaths = new[]
         {
-            _logger.Warning(ex, "Failed to load Pixe.la heatmap");
-            PixelaStatus.Text = "Could not load heatmap";
+            Path.GetFullPath(Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "..", "..", "..", "..", "..", "kegomodoro", "dependencies", "heatmap", "heatmap-dark.svg")),
+            Path.GetFullPath(Path.Combine(AppDomain.CurrentDomain.BaseDirectory, "..", "..", "..", "..", "kegomodoro", "dependencies", "heatmap", "heatmap-dark.svg"))
+        };
+
+        foreach (var path in possiblePaths)
+        {
+            try
+            {
+                if (File.Exists(path))
+                {
+                    _logger.Information("Using local heatmap from {Path}", path);
+                    return File.ReadAllText(path);
+                }
+            }
+            catch (IOException ex)
+            {
+                _logger.Warning(ex, "Could not read local heatmap {Path}", path);
+            }
         }
+        return "";
     }
 
     private void PixelaHeatmapWebView_WebMessageReceived(object? sender, Microsoft.Web.WebView2.Core.CoreWebView2WebMessageReceivedEventArgs e)
@@ -713,7 +761,8 @@ public partial class MainWindow : System.Windows.Window
                 
                 _logger.Information("Pixel clicked: {Date} - {Text}", dateStr, text);
 
-                if (_currentUser != null)
+                // Pixels of the local heatmap can only be edited once Pixe.la is set up
+                if (_currentUser != null && _pixelaService.IsConfigured(_currentUser))
                 {
                     var editWindow = new Views.PixelEditWindow(_pixelaService, _userService, _currentUser)
                     {
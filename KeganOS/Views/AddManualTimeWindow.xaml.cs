@@ -5,6 +5,7 @@ using System.Windows;
 using System.Windows.Input;
 using KeganOS.Core.Interfaces;
 using KeganOS.Core.Models;
+using KeganOS.Infrastructure.Services;
 using Serilog;
 
 namespace KeganOS.Views;
@@ -276,59 +277,8 @@ public partial class AddManualTimeWindow : Window
         {
             try
             {
-                var dateStr = date.ToString("MM/dd/yyyy");
-                var content = File.Exists(journeyPath) ? File.ReadAllText(journeyPath, System.Text.Encoding.UTF8) : "";
-                
-                // Check if date already exists in the file
-                var datePattern = new System.Text.RegularExpressions.Regex(
-                    $@"\n\n{System.Text.RegularExpressions.Regex.Escape(dateStr)}\n(\d{{2}}:\d{{2}}:\d{{2}})(.*)(?=\n\n|\Z)", 
-                    System.Text.RegularExpressions.RegexOptions.Singleline);
-                
-                var match = datePattern.Match(content);
-                
-                if (match.Success)
-                {
-                    // Date exists - sum the hours and merge notes
-                    var existingTimeStr = match.Groups[1].Value;
-                    var existingNotes = match.Groups[2].Value.Trim();
-                    
-                    // Parse existing time
-                    if (TimeSpan.TryParse(existingTimeStr, out var existingTime))
-                    {
-                        var newTotalTime = existingTime.Add(duration);
-                        var newTimeStr = newTotalTime.ToString(@"hh\:mm\:ss");
-                        
-                        // Merge notes with proper line break
-                        var mergedNotes = existingNotes;
-                        if (!string.IsNullOrEmpty(note))
-                        {
-                            mergedNotes = string.IsNullOrEmpty(existingNotes) 
-                                ? note 
-                                : $"{existingNotes}\n\n{note}";
-                        }
-                        
-                        var newEntry = $"\n\n{dateStr}\n{newTimeStr}";
-                        if (!string.IsNullOrEmpty(mergedNotes))
-                        {
-                            newEntry += $" {mergedNotes}";
-                        }
-                        
-                        // Replace the old entry with the new one
-                        content = datePattern.Replace(content, newEntry, 1);
-                        File.WriteAllText(journeyPath, content, System.Text.Encoding.UTF8);
-                        _logger.Information("SUCCESS: Merged time for {Date} - now {Time}", dateStr, newTotalTime);
-                    }
-                    else
-                    {
-                        // Couldn't parse existing time - append as new
-                        AppendNewJourneyEntry(journeyPath, dateStr, duration, note);
-                    }
-                }
-                else
-                {
-                    // Date doesn't exist - append new entry
-                    AppendNewJourneyEntry(journeyPath, dateStr, duration, note);
-                }
+                // Hold KEGOMODORO's shared lock for the whole read-merge-write (see SharedFileAppender)
+                SharedFileAppender.WithLock(journeyPath, () => MergeJourneyEntry(journeyPath, date, duration, note));
             }
             catch (Exception ex)
             {
@@ -349,9 +299,9 @@ public partial class AddManualTimeWindow : Window
         {
             try
             {
-                // KEGOMODORO time.csv format: hours,minute,second (one row per entry)
+                // KEGOMODORO time.csv format: hours,minute,second (one complete, newline-terminated row per entry)
                 var line = $"{(int)duration.TotalHours},{duration.Minutes},{duration.Seconds}";
-                File.AppendAllText(timeCsvPath, $"\n{line}");
+                SharedFileAppender.AppendRecord(timeCsvPath, line);
                 _logger.Information("SUCCESS: Saved to time.csv: {Path}", timeCsvPath);
             }
             catch (Exception ex)
@@ -365,6 +315,63 @@ public partial class AddManualTimeWindow : Window
             _logger.Warning("Time CSV path is empty - cannot save!");
         }
     }
+
+    private void MergeJourneyEntry(string journeyPath, DateTime date, TimeSpan duration, string note)
+    {
+        var dateStr = date.ToString("MM/dd/yyyy");
+        var content = File.Exists(journeyPath) ? File.ReadAllText(journeyPath, System.Text.Encoding.UTF8) : "";
+        
+        // Check if date already exists in the file
+        var datePattern = new System.Text.RegularExpressions.Regex(
+            $@"\n\n{System.Text.RegularExpressions.Regex.Escape(dateStr)}\n(\d{{2}}:\d{{2}}:\d{{2}})(.*)(?=\n\n|\Z)", 
+            System.Text.RegularExpressions.RegexOptions.Singleline);
+        
+        var match = datePattern.Match(content);
+        
+        if (match.Success)
+        {
+            // Date exists - sum the hours and merge notes
+            var existingTimeStr = match.Groups[1].Value;
+            var existingNotes = match.Groups[2].Value.Trim();
+            
+            // Parse existing time
+            if (TimeSpan.TryParse(existingTimeStr, out var existingTime))
+            {
+                var newTotalTime = existingTime.Add(duration);
+                var newTimeStr = newTotalTime.ToString(@"hh\:mm\:ss");
+                
+                // Merge notes with proper line break
+                var mergedNotes = existingNotes;
+                if (!string.IsNullOrEmpty(note))
+                {
+                    mergedNotes = string.IsNullOrEmpty(existingNotes) 
+                        ? note 
+                        : $"{existingNotes}\n\n{note}";
+                }
+                
+                var newEntry = $"\n\n{dateStr}\n{newTimeStr}";
+                if (!string.IsNullOrEmpty(mergedNotes))
+                {
+                    newEntry += $" {mergedNotes}";
+                }
+                
+                // Replace the old entry with the new one
+                content = datePattern.Replace(content, newEntry, 1);
+                SharedFileAppender.ReplaceContent(journeyPath, content);
+                _logger.Information("SUCCESS: Merged time for {Date} - now {Time}", dateStr, newTotalTime);
+            }
+            else
+            {
+                // Couldn't parse existing time - append as new
+                AppendNewJourneyEntry(journeyPath, dateStr, duration, note);
+            }
+        }
+        else
+        {
+            // Date doesn't exist - append new entry
+            AppendNewJourneyEntry(journeyPath, dateStr, duration, note);
+        }
+    }
     
     private void AppendNewJourneyEntry(string journeyPath, string dateStr, TimeSpan duration, string note)
     {
@@ -373,7 +380,7 @@ public partial class AddManualTimeWindow : Window
         {
             entry += $" {note}";
         }
-        File.AppendAllText(journeyPath, entry, System.Text.Encoding.UTF8);
+        SharedFileAppender.AppendRecord(journeyPath, entry, terminate: false);
         _logger.Information("SUCCESS: Appended new entry to journey file: {Path}", journeyPath);
     }
 }
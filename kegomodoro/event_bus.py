@@ -0,0 +1,237 @@
+"""In-process event bus for KEGOMODORO.
+
+The timer publishes what happened (a phase started, a session was saved...) and goes
+straight back to ticking. Every subscriber has its own queue and worker thread, so a
+slow one (Pixela over a bad connection, a stuck sound device) only delays itself.
+When a queue is full the subscriber's policy decides what gives:
+
+    DROP_OLDEST  forget the oldest queued event (sounds, status updates)
+    DROP_NEWEST  forget the new event
+    BLOCK        wait up to `block_timeout` for room, then drop the new event
+    KEEP_ALL     never drop and never wait: the queue is unbounded and `maxsize`
+                 only marks where a warning is printed (persistence: saved
+                 sessions and phases must reach the disk)
+
+Handlers run on worker threads; anything that touches Tk has to stay on the UI thread.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+KEEP_ALL = "keep_all"
+
+
+# ---------------------------- EVENTS ------------------------------- #
+@dataclass(frozen=True)
+class PhaseStarted:
+    mode: str               # "pomodoro" or "stopwatch"
+    phase: str              # "work", "new_work", "short_break", "long_break"
+    reps: int
+    duration_seconds: int
+
+
+@dataclass(frozen=True)
+class PhaseEnded:
+    mode: str
+    phase: str
+    reps: int               # reps when the phase started (its cycle index)
+    outcome: str = "completed"      # "completed", "skipped" or "interrupted"
+    started_at: float = 0.0         # unix time
+    planned_seconds: int = 0
+    actual_seconds: int = 0
+
+
+@dataclass(frozen=True)
+class Paused:
+    mode: str
+    paused: bool            # False when resumed
+
+
+@dataclass(frozen=True)
+class SessionSaved:
+    hours: int
+    minute: int
+    second: int
+    show_hours: bool
+    note: str
+    separator: str          # blank lines written before the journal entry
+    date: str               # MM/DD/YYYY, as written to the journal
+
+
+@dataclass(frozen=True)
+class DataWritten:
+    path: str               # file a persistence subscriber just appended to
+
+
+# ---------------------------- SUBSCRIBERS ------------------------------- #
+class Subscriber:
+    """One handler with its own queue, worker thread and latency metrics"""
+
+    def __init__(self, name, handler, event_types, maxsize=64, policy=DROP_OLDEST, block_timeout=0.05):
+        self.name = name
+        self.handler = handler
+        self.event_types = tuple(event_types)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.maxsize = maxsize
+        self.queue = queue.Queue(0 if policy == KEEP_ALL else maxsize)
+        self.handled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_queue = 0
+        self.total_wait = 0.0       # publish -> handler start
+        self.max_wait = 0.0
+        self.total_run = 0.0        # time spent inside the handler
+        self.max_run = 0.0
+        self._lock = threading.Lock()
+        self._offer_lock = threading.Lock()     # no event can slip in behind the stop sentinel
+        self.closing = threading.Event()
+        self.thread = threading.Thread(target=self._work, name=f"EventBus-{name}", daemon=True)
+        self.thread.start()
+
+    def wants(self, event):
+        return isinstance(event, self.event_types)
+
+    def offer(self, item):
+        """Queue (published_at, event) without ever blocking longer than the policy allows"""
+        with self._offer_lock:
+            if not self.closing.is_set():
+                self._offer(item)
+
+    def _offer(self, item):
+        if self.policy == KEEP_ALL:
+            self.queue.put_nowait(item)
+            queued = self.queue.qsize()
+            with self._lock:
+                self.max_queue = max(self.max_queue, queued)
+            if queued == self.maxsize + 1:
+                print(f"EventBus: {self.name} is falling behind, more than {self.maxsize} events queued")
+            return
+        try:
+            if self.policy == BLOCK:
+                self.queue.put(item, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(item)
+        except queue.Full:
+            if self.policy != DROP_OLDEST:
+                self._drop(item)
+                return
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self._count_drop()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                self._drop(item)
+                return
+        with self._lock:
+            self.max_queue = max(self.max_queue, self.queue.qsize())
+
+    def _count_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def _drop(self, item):
+        self._count_drop()
+        print(f"EventBus: {self.name} is falling behind, dropped {type(item[1]).__name__}")
+
+    def stop(self, timeout):
+        """Stop taking events and wake the worker once what's queued is handled. Nothing is offered
+        after `closing` is set, so the sentinel can't be evicted by DROP_OLDEST."""
+        with self._offer_lock:
+            self.closing.set()
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass  # The worker sees `closing` once it has emptied the queue
+
+    def _work(self):
+        while True:
+            if self.closing.is_set() and self.queue.empty():
+                return
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            published_at, event = item
+            started = time.perf_counter()
+            try:
+                self.handler(event)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"EventBus: {self.name} failed on {type(event).__name__}: {e}")
+            finished = time.perf_counter()
+            with self._lock:
+                self.handled += 1
+                self.total_wait += started - published_at
+                self.max_wait = max(self.max_wait, started - published_at)
+                self.total_run += finished - started
+                self.max_run = max(self.max_run, finished - started)
+            self.queue.task_done()
+
+    def metrics(self):
+        with self._lock:
+            handled = max(self.handled, 1)
+            return {
+                "handled": self.handled,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "queued": self.queue.qsize(),
+                "max_queue": self.max_queue,
+                "avg_wait_ms": self.total_wait / handled * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_run_ms": self.total_run / handled * 1000,
+                "max_run_ms": self.max_run * 1000,
+            }
+
+
+class EventBus:
+    def __init__(self):
+        self.subscribers = []
+        self.published = 0
+        self.publish_time = 0.0     # total time the publisher spent in publish()
+        self.closed = False
+
+    def subscribe(self, name, handler, *event_types, maxsize=64, policy=DROP_OLDEST, block_timeout=0.05):
+        """Run handler(event) on its own worker for every event of the given types"""
+        subscriber = Subscriber(name, handler, event_types, maxsize, policy, block_timeout)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def publish(self, event):
+        """Hand the event to every interested subscriber; never runs a handler inline. A no-op once
+        close() has started (e.g. DataWritten from a persistence worker that is draining)."""
+        if self.closed:
+            return
+        started = time.perf_counter()
+        for subscriber in self.subscribers:
+            if subscriber.wants(event):
+                subscriber.offer((started, event))
+        self.published += 1
+        self.publish_time += time.perf_counter() - started
+
+    def metrics(self):
+        return {subscriber.name: subscriber.metrics() for subscriber in self.subscribers}
+
+    def close(self, timeout=2.0):
+        """Let the workers finish what's queued, then stop them. KEEP_ALL subscribers are waited for
+        without a timeout so saved sessions reach the disk."""
+        self.closed = True
+        deadline = time.monotonic() + timeout
+        for subscriber in self.subscribers:
+            subscriber.stop(max(deadline - time.monotonic(), 0.01))
+        for subscriber in self.subscribers:
+            if subscriber.policy == KEEP_ALL:
+                subscriber.thread.join()
+            else:
+                subscriber.thread.join(max(deadline - time.monotonic(), 0))
+                if subscriber.thread.is_alive():
+                    print(f"EventBus: {subscriber.name} did not drain in time")
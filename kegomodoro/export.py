@@ -0,0 +1,235 @@
+"""Export KEGOMODORO history (time.csv sessions, journal notes, Pomodoro phases) as CSV, JSON Lines or Parquet.
+
+Records are read and written in chunks, so memory stays flat however long the
+history is. With --incremental only records added since the last export are
+written; where each source was left off is kept in export_watermark.json. For
+time.csv and the phase log that's a byte offset (both are append-only). The journal
+is rewritten in place by KeganOS, which merges into the last entry, so for it the
+watermark is the offset of the last exported entry, a hash of the bytes before it
+and a digest of that entry: the entry is read again every run and exported again if
+it changed, and a changed prefix means the whole journal is exported again. Phases
+carry their phase, outcome, cycle and planned length in the note column.
+
+--incremental can't be combined with --since/--until: records filtered out would
+otherwise be skipped for good.
+
+    python export.py history.jsonl
+    python export.py notes.csv --kind notes --since 2025-12-01 --until 2025-12-31
+    python export.py new.parquet --incremental
+"""
+import argparse
+import csv
+import datetime as dt
+import hashlib
+import json
+import os
+import sys
+from functools import partial
+from itertools import islice
+
+from history import anchor, iter_notes, iter_sessions
+from paths import EXPORT_WATERMARK_PATH, PHASE_HISTORY_PATH, SAVE_FILE_NAME, TIME_CSV_PATH
+from phase_history import iter_phases
+
+FIELDS = ["kind", "date", "offset", "hours", "minute", "second", "duration_seconds", "note"]
+FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_CHUNK_SIZE = 5000
+
+
+# ---------------------------- WRITERS ------------------------------- #
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline='', encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write_chunk(self, records):
+        self.writer.writerows(records)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write_chunk(self, records):
+        self.file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Needs pyarrow; each chunk becomes one row group"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+        self.pa = pa
+        self.schema = pa.schema([
+            ("kind", pa.string()), ("date", pa.date32()), ("offset", pa.int64()),
+            ("hours", pa.int32()), ("minute", pa.int32()), ("second", pa.int32()),
+            ("duration_seconds", pa.int64()), ("note", pa.string()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_chunk(self, records):
+        columns = {field: [record[field] for record in records] for field in FIELDS}
+        columns["date"] = [dt.date.fromisoformat(date) if date else None for date in columns["date"]]
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonLinesWriter, "parquet": ParquetWriter}
+
+
+# ---------------------------- WATERMARK ------------------------------- #
+def load_watermark(path=EXPORT_WATERMARK_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_watermark(watermark, path=EXPORT_WATERMARK_PATH):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(watermark, file, indent=2)
+    os.replace(temp_path, path)
+
+
+def _start_offset(watermark, key, source_path):
+    """Resume offset for a source; start over if the file shrank (it was rewritten)"""
+    offset = watermark.get(key, 0)
+    try:
+        if offset > os.path.getsize(source_path):
+            print(f"{source_path} is smaller than the last export, exporting it again from the start")
+            return 0
+    except OSError:
+        return 0
+    return offset
+
+
+def _entry_digest(record):
+    """Identifies a journal entry's content, so a merged-into entry is noticed"""
+    raw = json.dumps([record["date"], record["duration_seconds"], record["note"]], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _notes_resume(mark, notes_path):
+    """(start offset, digest of the entry there) for the journal; (0, None) means export it all"""
+    if not isinstance(mark, dict):
+        return 0, None  # No watermark, or one from before entries were tracked
+    try:
+        if os.path.getsize(notes_path) >= mark["resume"] and anchor(notes_path, mark["resume"]) == mark["anchor"]:
+            return mark["resume"], mark["last"]
+    except (OSError, KeyError):
+        pass
+    print(f"{notes_path} was rewritten since the last export, exporting it again from the start")
+    return 0, None
+
+
+def _notes_mark(record, notes_path):
+    return {"resume": record["offset"], "anchor": anchor(notes_path, record["offset"]),
+            "last": _entry_digest(record)}
+
+
+# ---------------------------- EXPORT ------------------------------- #
+def _in_range(record, since, until):
+    if since is None and until is None:
+        return True
+    if record["date"] is None:
+        return False  # time.csv rows carry no date, they can't match a date filter
+    return (since is None or record["date"] >= since) and (until is None or record["date"] <= until)
+
+
+def export(output_path, fmt=None, kind="all", since=None, until=None, incremental=False,
+           chunk_size=DEFAULT_CHUNK_SIZE, sessions_path=TIME_CSV_PATH, notes_path=SAVE_FILE_NAME,
+           phases_path=PHASE_HISTORY_PATH, watermark_path=EXPORT_WATERMARK_PATH):
+    """Stream records into output_path, returns how many were written"""
+    fmt = fmt or os.path.splitext(output_path)[1].lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}, use one of {', '.join(FORMATS)}")
+    if incremental and (since is not None or until is not None):
+        raise ValueError("--incremental can't be combined with --since/--until")
+    since = since.isoformat() if isinstance(since, dt.date) else since
+    until = until.isoformat() if isinstance(until, dt.date) else until
+
+    watermark = load_watermark(watermark_path) if incremental else {}
+    sources = []
+    if kind in ("all", "sessions") and os.path.exists(sessions_path):
+        # Only an incremental run holds back an unterminated last row (it may still be being written)
+        sources.append(("sessions", sessions_path, partial(iter_sessions, include_tail=not incremental)))
+    if kind in ("all", "notes") and os.path.exists(notes_path):
+        sources.append(("notes", notes_path, iter_notes))
+    if kind in ("all", "phases") and os.path.exists(phases_path):
+        sources.append(("phases", phases_path, iter_phases))
+
+    writer = WRITERS[fmt](output_path)
+    written = 0
+    reached = {}
+    try:
+        for key, source_path, reader in sources:
+            seen_digest = None
+            if key == "notes":
+                start, seen_digest = _notes_resume(watermark.get(key), source_path)
+                reached[key] = watermark.get(key) if start else None
+            else:
+                start = reached[key] = _start_offset(watermark, key, source_path)
+            stream = reader(source_path, start)
+            while True:
+                chunk = list(islice(stream, chunk_size))
+                if not chunk:
+                    break
+                records = [record for record, _ in chunk if _in_range(record, since, until)]
+                if seen_digest is not None and records and records[0]["offset"] == start:
+                    if _entry_digest(records[0]) == seen_digest:
+                        records = records[1:]  # Exported last time and unchanged since
+                    seen_digest = None
+                if records:
+                    writer.write_chunk(records)
+                    written += len(records)
+                if key == "notes":
+                    reached[key] = _notes_mark(chunk[-1][0], source_path)
+                else:
+                    reached[key] = chunk[-1][1]
+    finally:
+        writer.close()
+
+    if incremental:
+        watermark.update({key: mark for key, mark in reached.items() if mark is not None})
+        watermark["exported_at"] = dt.datetime.now().isoformat(timespec="seconds")
+        save_watermark(watermark, watermark_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export KEGOMODORO session, journal and phase history")
+    parser.add_argument("output", help="File to write (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the output file's extension")
+    parser.add_argument("--kind", choices=("all", "sessions", "notes", "phases"), default="all")
+    parser.add_argument("--since", type=dt.date.fromisoformat, help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--until", type=dt.date.fromisoformat, help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--incremental", action="store_true", help="Only records added since the last export")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    try:
+        count = export(args.output, args.format, args.kind, args.since, args.until,
+                       args.incremental, args.chunk_size)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Export failed: {e}")
+        return 1
+    print(f"Exported {count} records to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""Pixela-style yearly heatmap rendered from the local notes journal and Pomodoro phase history.
+
+The per-day totals are kept in heatmap_cache.json together with the byte offset of the
+journal's last entry, so a refresh only parses what was written since (the last entry
+is always re-read, KeganOS may still merge into it). If the journal was rewritten
+before that point the totals are rebuilt from scratch. Work phases from
+phase_history.bin are added the same way, from the record count reached last time.
+The SVG (and optional PNG) is only rendered again when the day or the data changed.
+
+    python heatmap.py                          # dependencies/heatmap/heatmap.svg
+    python heatmap.py --appearance dark --png heatmap.png
+"""
+import argparse
+import datetime as dt
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+
+from history import anchor, iter_notes
+from paths import HEATMAP_DIR, PHASE_HISTORY_PATH, SAVE_FILE_NAME
+from phase_history import PhaseHistory
+
+CACHE_PATH = os.path.join(HEATMAP_DIR, "heatmap_cache.json")
+CACHE_VERSION = 2
+
+# Pixela graph colors; each shade is the color blended over white like Pixela does
+# (momiji gives exactly the #ffd5d5 / #ff8080 / #ff2b2b / #ff0000 of KeganOS' graph.svg)
+PIXELA_COLORS = {
+    "shibafu": "#008000",
+    "momiji": "#ff0000",
+    "sora": "#0000ff",
+    "ichou": "#ffd700",
+    "ajisai": "#800080",
+    "kuro": "#000000",
+}
+LEVEL_WEIGHTS = (1 / 6, 1 / 2, 5 / 6, 1.0)
+APPEARANCES = {
+    "light": {"empty": "#eeeeee", "text": "#000000", "background": "white"},
+    "dark": {"empty": "#161b22", "text": "#ffffff", "background": "black"},
+}
+
+CELL = 10
+COLUMN_STEP = 13
+ROW_STEP = 12
+WEEKS = 53
+WIDTH, HEIGHT = 720, 135
+OFFSET_X, OFFSET_Y = 16, 20
+
+_refresh_lock = threading.Lock()
+
+
+# ---------------------------- DAILY TOTALS ------------------------------- #
+class HeatmapCache:
+    """Per-day seconds from the journal and the phase history, updated incrementally"""
+
+    def __init__(self, journal_path=SAVE_FILE_NAME, cache_path=CACHE_PATH, phase_path=PHASE_HISTORY_PATH):
+        self.journal_path = journal_path
+        self.cache_path = cache_path
+        self.phase_history = PhaseHistory(phase_path)
+        self.state = self._load()
+
+    def _empty(self):
+        return {"version": CACHE_VERSION, "resume": 0, "anchor": None, "days": {}, "rendered": {},
+                "phases": {"count": 0, "days": {}}}
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return self._empty()
+        return state if state.get("version") == CACHE_VERSION else self._empty()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file)
+        os.replace(temp_path, self.cache_path)
+
+    def _can_resume(self):
+        resume = self.state["resume"]
+        if resume == 0:
+            return True
+        try:
+            return os.path.getsize(self.journal_path) >= resume and \
+                anchor(self.journal_path, resume) == self.state["anchor"]
+        except OSError:
+            return False
+
+    def totals(self):
+        """{ISO date: seconds}; entries without a duration count as zero"""
+        totals = self._journal_totals()
+        for day, seconds in self._phase_totals().items():
+            totals[day] = totals.get(day, 0) + seconds
+        return totals
+
+    def _phase_totals(self):
+        phases = self.state["phases"]
+        count = self.phase_history.count()
+        if count < phases["count"]:
+            phases = self.state["phases"] = {"count": 0, "days": {}}  # The log was replaced
+        try:
+            new = self.phase_history.daily_totals(start=phases["count"], stop=count)
+        except ValueError as e:
+            print(f"Skipping the phase history: {e}")
+            return phases["days"]
+        for day, seconds in new.items():
+            phases["days"][day] = phases["days"].get(day, 0) + seconds
+        phases["count"] = count
+        return phases["days"]
+
+    def _journal_totals(self):
+        if not os.path.exists(self.journal_path):
+            return {}
+        if not self._can_resume():
+            kept = {key: self.state[key] for key in ("rendered", "phases")}
+            self.state = self._empty()
+            self.state.update(kept)  # Neither depends on the journal
+
+        days = self.state["days"]
+        last = None
+        for record, _ in iter_notes(self.journal_path, self.state["resume"]):
+            if last is not None:
+                days[last["date"]] = days.get(last["date"], 0) + (last["duration_seconds"] or 0)
+            last = record
+        totals = dict(days)
+        if last is not None:
+            # The newest entry stays out of the stored totals and is read again next time
+            self.state["resume"] = last["offset"]
+            self.state["anchor"] = anchor(self.journal_path, last["offset"])
+            self.state["tail"] = {"date": last["date"], "seconds": last["duration_seconds"] or 0}
+        tail = self.state.get("tail")
+        if tail:
+            totals[tail["date"]] = totals.get(tail["date"], 0) + tail["seconds"]
+        return totals
+
+
+# ---------------------------- RENDERING ------------------------------- #
+def _blend(color, weight):
+    color = color.lstrip("#")
+    channels = [int(color[i:i + 2], 16) for i in (0, 2, 4)]
+    return "#" + "".join(f"{round(255 + (channel - 255) * weight):02x}" for channel in channels)
+
+
+def _shades(color):
+    color = PIXELA_COLORS.get(color, color)
+    return [_blend(color, weight) for weight in LEVEL_WEIGHTS]
+
+
+def _grid(end):
+    """(column, row, date) for the 53 weeks ending with `end`, weeks starting on Sunday"""
+    last_sunday = end - dt.timedelta(days=(end.weekday() + 1) % 7)
+    first = last_sunday - dt.timedelta(weeks=WEEKS - 1)
+    day = first
+    while day <= end:
+        offset = (day - first).days
+        yield offset // 7, offset % 7, day
+        day += dt.timedelta(days=1)
+
+
+def _level(hours, peak):
+    if hours <= 0 or peak <= 0:
+        return 0
+    return min(math.ceil(hours / peak * len(LEVEL_WEIGHTS)), len(LEVEL_WEIGHTS))
+
+
+def cells(totals, end):
+    """(column, row, date, hours, level) for every day shown"""
+    grid = list(_grid(end))
+    hours = {day: totals.get(day.isoformat(), 0) / 3600 for _, _, day in grid}
+    peak = max(hours.values(), default=0)
+    return [(column, row, day, hours[day], _level(hours[day], peak)) for column, row, day in grid]
+
+
+def render_svg(totals, end, color="momiji", appearance="light", unit="hours"):
+    style = APPEARANCES[appearance]
+    colors = [style["empty"]] + _shades(color)
+    days = cells(totals, end)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" viewBox="0 0 {WIDTH} {HEIGHT}">',
+        f'<style>.month, .legend {{ font-family: arial; font-size: 10px; fill: {style["text"]}; }}</style>',
+        f'<rect x="0" y="0" width="{WIDTH}" height="{HEIGHT}" fill="{style["background"]}" '
+        f'fill-opacity="0.5" stroke="none"/>',
+        f'<g transform="translate({OFFSET_X}, {OFFSET_Y})">',
+    ]
+    for column, row, day, hours, level in days:
+        if day.day == 1 or (column == 0 and row == 0):
+            parts.append(f'<text x="{column * COLUMN_STEP + 7}" y="-5" class="month">{day.month}</text>')
+        parts.append(
+            f'<rect class="day" rx="2" ry="2" width="{CELL}" height="{CELL}" x="{column * COLUMN_STEP}" '
+            f'y="{row * ROW_STEP}" fill="{colors[level]}" data-count="{hours:.2f}" data-date="{day.isoformat()}">'
+            f'<title>{day.isoformat()} : {hours:.2f} {unit}</title></rect>')
+    parts.append('<text class="legend" x="553" y="113">0</text>')
+    for index, legend_color in enumerate(colors):
+        parts.append(f'<rect rx="2" ry="2" width="{CELL}" height="{CELL}" x="{566 + index * 15}" y="104" '
+                     f'fill="{legend_color}"/>')
+    parts.append('<text class="legend" x="648" y="113">+</text>')
+    parts.append("</g></svg>")
+    return "\n".join(parts)
+
+
+def render_png(totals, end, path, color="momiji", appearance="light", scale=2):
+    """Same layout as the SVG, drawn with Pillow"""
+    from PIL import Image, ImageDraw
+    style = APPEARANCES[appearance]
+    colors = [style["empty"]] + _shades(color)
+    image = Image.new("RGB", (WIDTH * scale, HEIGHT * scale), "#000000" if appearance == "dark" else "#ffffff")
+    draw = ImageDraw.Draw(image)
+    for column, row, day, hours, level in cells(totals, end):
+        x = (OFFSET_X + column * COLUMN_STEP) * scale
+        y = (OFFSET_Y + row * ROW_STEP) * scale
+        if day.day == 1 or (column == 0 and row == 0):
+            draw.text((x, (OFFSET_Y - 14) * scale), str(day.month), fill=style["text"])
+        draw.rounded_rectangle((x, y, x + CELL * scale, y + CELL * scale), radius=2 * scale, fill=colors[level])
+    legend_y = (OFFSET_Y + 104) * scale
+    draw.text(((OFFSET_X + 553) * scale, legend_y), "0", fill=style["text"])
+    for index, legend_color in enumerate(colors):
+        x = (OFFSET_X + 566 + index * 15) * scale
+        draw.rounded_rectangle((x, legend_y, x + CELL * scale, legend_y + CELL * scale), radius=2 * scale,
+                               fill=legend_color)
+    draw.text(((OFFSET_X + 648) * scale, legend_y), "+", fill=style["text"])
+    temp_path = f"{path}.tmp"
+    image.save(temp_path, format="PNG")
+    os.replace(temp_path, path)
+
+
+def _write_text(path, text):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+
+def refresh(appearances=("light", "dark"), color="momiji", png=False, end=None, cache=None):
+    """Bring heatmap.svg / heatmap-dark.svg (and .png) up to date; returns the files that were rendered"""
+    with _refresh_lock:
+        cache = cache or HeatmapCache()
+        totals = cache.totals()
+        end = end or dt.date.today()
+        first_shown = end - dt.timedelta(weeks=WEEKS)
+        shown = sorted((day, seconds) for day, seconds in totals.items() if day > first_shown.isoformat())
+        written = []
+        for appearance in appearances:
+            name = "heatmap" if appearance == "light" else f"heatmap-{appearance}"
+            outputs = [os.path.join(HEATMAP_DIR, f"{name}.svg")]
+            if png:
+                outputs.append(os.path.join(HEATMAP_DIR, f"{name}.png"))
+            key = hashlib.sha1(json.dumps([end.isoformat(), color, shown]).encode("utf-8")).hexdigest()
+            if cache.state["rendered"].get(name) == key and all(os.path.exists(path) for path in outputs):
+                continue
+            os.makedirs(HEATMAP_DIR, exist_ok=True)
+            _write_text(outputs[0], render_svg(totals, end, color, appearance))
+            if png:
+                render_png(totals, end, outputs[1], color, appearance)
+            cache.state["rendered"][name] = key
+            written.extend(outputs)
+        cache.save()
+        return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a Pixela-style heatmap from the local journal and phase history")
+    parser.add_argument("--out", help="SVG path (default: dependencies/heatmap/heatmap.svg)")
+    parser.add_argument("--png", help="Also write a PNG here (needs Pillow)")
+    parser.add_argument("--appearance", choices=sorted(APPEARANCES), default="light")
+    parser.add_argument("--color", default="momiji", help="Pixela color name or #rrggbb")
+    parser.add_argument("--end", type=dt.date.fromisoformat, help="Last day shown (YYYY-MM-DD, default today)")
+    parser.add_argument("--rebuild", action="store_true", help="Forget the cached totals first")
+    args = parser.parse_args(argv)
+
+    cache = HeatmapCache()
+    if args.rebuild:
+        cache.state = cache._empty()
+    totals = cache.totals()
+    cache.save()
+    end = args.end or dt.date.today()
+    out = args.out or os.path.join(HEATMAP_DIR, "heatmap.svg")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    _write_text(out, render_svg(totals, end, args.color, args.appearance))
+    print(f"Wrote {out}")
+    if args.png:
+        try:
+            render_png(totals, end, args.png, args.color, args.appearance)
+            print(f"Wrote {args.png}")
+        except ImportError:
+            print("Pillow is not installed, skipped the PNG")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
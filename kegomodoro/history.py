@@ -0,0 +1,149 @@
+"""Streaming readers for KEGOMODORO's session history.
+
+time.csv holds one `hours,minute,second` row per saved stopwatch session. The notes
+journal holds entries like
+
+    12/21/2025
+    01:45:23 Focus session on Python project
+
+separated by blank lines (KeganOS writes `MM.DD.YYYY` dates, main.py `MM/DD/YYYY`,
+and short sessions are written as `MM:SS`). Both readers go through the file line by
+line and report byte offsets, so callers can resume from where they stopped.
+
+Both follow the readers' rule of shared_append.py: a last line without a newline may
+still be being written, so it is skipped unless it's wanted (include_tail) and nobody
+holds the file's lock.
+"""
+import datetime as dt
+import hashlib
+import os
+import re
+
+from shared_append import is_locked
+
+DATE_LINE = re.compile(r"^\s*(\d{1,2})[./](\d{1,2})[./](\d{4})\s*$")
+DURATION = re.compile(r"^(\d{1,3}):(\d{2})(?::(\d{2}))?(?:\s+(.*))?$", re.DOTALL)
+BOM = b"\xef\xbb\xbf"
+ANCHOR_BYTES = 256          # bytes before a resume offset that must be unchanged to resume there
+
+
+def parse_duration(text):
+    """'01:45:23' or '45:23' -> (seconds, rest of the line); (None, text) if it isn't a duration"""
+    match = DURATION.match(text.strip())
+    if not match:
+        return None, text.strip()
+    first, second, third, rest = match.groups()
+    if third is None:
+        seconds = int(first) * 60 + int(second)
+    else:
+        seconds = int(first) * 3600 + int(second) * 60 + int(third)
+    return seconds, (rest or "").strip()
+
+
+def anchor(path, offset):
+    """Hash of the bytes just before `offset`; if it changed, the file was rewritten before that point"""
+    with open(path, "rb") as file:
+        start = max(offset - ANCHOR_BYTES, 0)
+        file.seek(start)
+        return hashlib.sha1(file.read(offset - start)).hexdigest()
+
+
+def _lines(path, start_offset):
+    """(offset, end offset, line, terminated) for every line from start_offset, decoded as utf-8"""
+    with open(path, "rb") as file:
+        file.seek(start_offset)
+        offset = start_offset
+        for raw in file:
+            line_offset = offset
+            offset += len(raw)
+            terminated = raw.endswith(b"\n")
+            if line_offset == 0 and raw.startswith(BOM):
+                raw = raw[len(BOM):]
+            yield line_offset, offset, raw.decode("utf-8", errors="replace"), terminated
+
+
+def iter_sessions(path, start_offset=0, include_tail=False):
+    """Yield (record, end_offset) for every row of time.csv after start_offset.
+
+    include_tail: also use an unterminated last row (legacy writers leave one) when it
+    parses and the file isn't locked. Incremental readers leave it out, it gets its
+    newline on the next append and is picked up then.
+    """
+    for line_offset, end_offset, line, terminated in _lines(path, start_offset):
+        if not terminated and (not include_tail or is_locked(path)):
+            break
+        parts = line.strip().split(",")
+        if len(parts) != 3:
+            continue
+        try:
+            hours, minute, second = (int(part) for part in parts)
+        except ValueError:
+            continue  # Header or a damaged row
+        record = {
+            "kind": "session",
+            "date": None,
+            "offset": line_offset,
+            "hours": hours,
+            "minute": minute,
+            "second": second,
+            "duration_seconds": hours * 3600 + minute * 60 + second,
+            "note": "",
+        }
+        yield record, end_offset
+
+
+def last_session(path, window=4096):
+    """Last complete time.csv record, read from the end of the file; None if there is none"""
+    size = os.path.getsize(path)
+    start = max(size - window, 0)
+    if start:
+        # Resume at the first full line inside the window
+        with open(path, "rb") as file:
+            file.seek(start)
+            start += file.read(window).find(b"\n") + 1
+    last = None
+    for record, _ in iter_sessions(path, start, include_tail=True):
+        last = record
+    if last is None and start:
+        return last_session(path, window * 4)
+    return last
+
+
+def iter_notes(path, start_offset=0):
+    """Yield (record, end_offset) for every journal entry that starts after start_offset.
+
+    While another writer holds the journal's lock the last entry is left out.
+    """
+    entry = None
+
+    def finish(entry, end_offset):
+        seconds, note = parse_duration(entry["text"].strip()) if entry["text"].strip() else (None, "")
+        return {
+            "kind": "note",
+            "date": entry["date"],
+            "offset": entry["offset"],
+            "hours": None if seconds is None else seconds // 3600,
+            "minute": None if seconds is None else seconds // 60 % 60,
+            "second": None if seconds is None else seconds % 60,
+            "duration_seconds": seconds,
+            "note": note,
+        }, end_offset
+
+    end_offset = start_offset
+    for line_offset, end_offset, line, _ in _lines(path, start_offset):
+        match = DATE_LINE.match(line)
+        if match:
+            month, day, year = (int(group) for group in match.groups())
+            try:
+                date = dt.date(year, month, day)
+            except ValueError:
+                date = None
+            if date is not None:
+                if entry is not None:
+                    yield finish(entry, line_offset)
+                entry = {"date": date.isoformat(), "offset": line_offset, "text": ""}
+                continue
+        if entry is not None:
+            entry["text"] += line
+    if entry is not None and not is_locked(path):
+        yield finish(entry, end_offset)
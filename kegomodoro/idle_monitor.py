@@ -0,0 +1,268 @@
+"""Input-activity sampling for KEGOMODORO.
+
+A small daemon thread asks an activity source "how long since the last keyboard/mouse
+input?" about once a second. The stopwatch reads the result on every tick and pauses
+itself when you've left the desk. Sampling keeps to a CPU budget: if a sample ever
+gets expensive the thread samples less often instead of eating CPU.
+
+Run `python idle_monitor.py` to measure the sampling overhead on this machine.
+"""
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 1.0       # seconds between samples
+MAX_INTERVAL = 10.0          # never back off further than this
+DEFAULT_CPU_BUDGET = 0.005   # fraction of one core (0.5%)
+
+
+# ---------------------------- ACTIVITY SOURCES ------------------------------- #
+class StubActivitySource:
+    """Source driven by hand, for tests and for machines with no usable input API"""
+    name = "stub"
+
+    def __init__(self, idle=0.0):
+        self._last_input = time.monotonic() - idle
+
+    def poke(self):
+        """Pretend the user just touched the keyboard"""
+        self._last_input = time.monotonic()
+
+    def set_idle(self, seconds):
+        self._last_input = time.monotonic() - seconds
+
+    def idle_seconds(self):
+        return time.monotonic() - self._last_input
+
+    def close(self):
+        pass
+
+
+class WindowsActivitySource:
+    """GetLastInputInfo, one syscall per sample"""
+    name = "win32"
+
+    class _LastInputInfo(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._info = self._LastInputInfo()
+        self._info.cbSize = ctypes.sizeof(self._info)
+
+    def idle_seconds(self):
+        if not self._user32.GetLastInputInfo(ctypes.byref(self._info)):
+            return 0.0
+        elapsed = (self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF
+        return elapsed / 1000.0
+
+    def close(self):
+        pass
+
+
+class X11ActivitySource:
+    """XScreenSaverQueryInfo from libXss, the X server tracks idle time for us"""
+    name = "x11"
+
+    class _ScreenSaverInfo(ctypes.Structure):
+        _fields_ = [("window", ctypes.c_ulong), ("state", ctypes.c_int), ("kind", ctypes.c_int),
+                    ("til_or_since", ctypes.c_ulong), ("idle", ctypes.c_ulong), ("eventMask", ctypes.c_ulong)]
+
+    def __init__(self):
+        x11_path = ctypes.util.find_library("X11")
+        xss_path = ctypes.util.find_library("Xss")
+        if not x11_path or not xss_path or not os.environ.get("DISPLAY"):
+            raise OSError("libX11/libXss or DISPLAY not available")
+        self._xlib = ctypes.cdll.LoadLibrary(x11_path)
+        self._xss = ctypes.cdll.LoadLibrary(xss_path)
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(self._ScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong,
+                                                    ctypes.POINTER(self._ScreenSaverInfo)]
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Could not open X display")
+        self._root = self._xlib.XDefaultRootWindow(self._display)
+        self._info = self._xss.XScreenSaverAllocInfo()
+
+    def idle_seconds(self):
+        if not self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info):
+            return 0.0
+        return self._info.contents.idle / 1000.0
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class EvdevActivitySource:
+    """Reads /dev/input/event* directly (Wayland/console, needs the `input` group)"""
+    name = "evdev"
+
+    def __init__(self, pattern="/dev/input/event*"):
+        self._fds = []
+        for path in sorted(glob.glob(pattern)):
+            try:
+                self._fds.append(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+            except OSError:
+                continue
+        if not self._fds:
+            raise OSError("No readable input devices")
+        self._last_input = time.monotonic()
+
+    def idle_seconds(self):
+        ready, _, _ = select.select(self._fds, [], [], 0)
+        if ready:
+            for fd in ready:
+                try:
+                    while os.read(fd, 4096):  # Drain, we only care that something happened
+                        pass
+                except (BlockingIOError, OSError):
+                    pass
+            self._last_input = time.monotonic()
+        return time.monotonic() - self._last_input
+
+    def close(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+
+class PollingActivitySource:
+    """Fallback using pyautogui (mouse position) and keyboard (key hook)"""
+    name = "polling"
+
+    def __init__(self, pyautogui_module, keyboard_module=None):
+        self._pyautogui = pyautogui_module
+        self._keyboard = keyboard_module
+        self._last_input = time.monotonic()
+        self._last_position = tuple(self._pyautogui.position())
+        if self._keyboard is not None:
+            self._hook = self._keyboard.hook(self._on_key)
+
+    def _on_key(self, event):
+        self._last_input = time.monotonic()
+
+    def idle_seconds(self):
+        position = tuple(self._pyautogui.position())
+        if position != self._last_position:
+            self._last_position = position
+            self._last_input = time.monotonic()
+        return time.monotonic() - self._last_input
+
+    def close(self):
+        if self._keyboard is not None:
+            try:
+                self._keyboard.unhook(self._hook)
+            except Exception:
+                pass
+
+
+def default_source(fallback_loaders=()):
+    """Pick the cheapest source that works here, None if nothing does.
+
+    fallback_loaders: callables returning (pyautogui, keyboard) modules, tried last.
+    """
+    candidates = []
+    if sys.platform == "win32":
+        candidates.append(WindowsActivitySource)
+    elif sys.platform.startswith("linux"):
+        candidates += [X11ActivitySource, EvdevActivitySource]
+    for candidate in candidates:
+        try:
+            return candidate()
+        except Exception as e:
+            print(f"Idle source {candidate.name} unavailable: {e}")
+    for loader in fallback_loaders:
+        try:
+            return PollingActivitySource(*loader())
+        except Exception as e:
+            print(f"Idle source polling unavailable: {e}")
+    return None
+
+
+def subtract_idle(hours, minute, second, idle_seconds):
+    """(hours, minute, second) with the idle span the stopwatch counted before pausing taken off"""
+    total = max(int(hours) * 3600 + int(minute) * 60 + int(second) - int(idle_seconds), 0)
+    hours, rest = divmod(total, 3600)
+    minute, second = divmod(rest, 60)
+    return hours, minute, second
+
+
+# ---------------------------- SAMPLER THREAD ------------------------------- #
+class IdleMonitor(threading.Thread):
+    """Samples `source` in the background; the UI thread just reads `is_idle`/`idle_seconds`"""
+
+    def __init__(self, source, threshold, interval=DEFAULT_INTERVAL, cpu_budget=DEFAULT_CPU_BUDGET,
+                 max_interval=MAX_INTERVAL):
+        super().__init__(name="IdleMonitor", daemon=True)
+        self.source = source
+        self.threshold = threshold
+        self.interval = interval
+        self.cpu_budget = cpu_budget
+        self.max_interval = max_interval
+        self.idle_seconds = 0.0
+        self.samples = 0
+        self.cpu_seconds = 0.0   # CPU spent by this thread
+        self.wall_seconds = 0.0
+        self._stop_event = threading.Event()
+
+    @property
+    def is_idle(self):
+        return self.threshold > 0 and self.idle_seconds >= self.threshold
+
+    @property
+    def cpu_fraction(self):
+        """Share of one core used by sampling so far"""
+        return self.cpu_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+    def sample(self):
+        """Take one sample and account for its cost"""
+        cpu_start = time.thread_time()
+        try:
+            self.idle_seconds = self.source.idle_seconds()
+        except Exception as e:
+            print(f"Idle sampling failed: {e}")
+            self.idle_seconds = 0.0
+        self.cpu_seconds += time.thread_time() - cpu_start
+        self.samples += 1
+
+    def run(self):
+        started = time.monotonic()
+        while not self._stop_event.is_set():
+            self.sample()
+            self.wall_seconds = time.monotonic() - started
+            # Over budget: sample less often rather than spend more CPU
+            if self.wall_seconds > 1 and self.cpu_fraction > self.cpu_budget:
+                self.interval = min(self.interval * 2, self.max_interval)
+            self._stop_event.wait(self.interval)
+        self.source.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+if __name__ == "__main__":
+    # Overhead benchmark: python idle_monitor.py [seconds] [interval]
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_INTERVAL
+    source = default_source() or StubActivitySource()
+    monitor = IdleMonitor(source, threshold=300, interval=interval)
+    monitor.start()
+    time.sleep(duration)
+    monitor.stop()
+    monitor.join()
+    per_sample = monitor.cpu_seconds / max(monitor.samples, 1) * 1e6
+    print(f"source={source.name} samples={monitor.samples} interval={monitor.interval}s "
+          f"cpu/sample={per_sample:.1f}us cpu={monitor.cpu_fraction * 100:.4f}% idle={monitor.idle_seconds:.1f}s")
@@ -7,6 +7,7 @@ import datetime as dt
 import datetime
 import time
 import threading
+import json
 from tkinter import *
 import tkinter as tk
 from tkinter import simpledialog
@@ -16,6 +17,16 @@ from time import sleep
 from pathlib import Path
 import atexit
 import sys
+from theme_engine import ThemeEngine, Theme, read_theme, TEXT, BG, ACCENT
+from idle_monitor import IdleMonitor, default_source, subtract_idle
+from shared_append import append_record
+from history import last_session
+from event_bus import EventBus, PhaseStarted, PhaseEnded, Paused, SessionSaved, DataWritten, DROP_OLDEST, KEEP_ALL
+from progress_ring import ProgressRing, PowerState
+from snapshots import start_snapshot_job
+from phase_history import PhaseHistory, PhaseClock, COMPLETED, INTERRUPTED
+import heatmap
+from timer_scheduler import TimerScheduler, KINDS, STOPWATCH, WORK
 
 # Lazy-loaded heavy modules (for faster startup)
 pd = None
@@ -149,6 +160,9 @@ SAVE_FILE_NAME = f"{TEXTS}/KAÆ[Æß#.txt" # ! Change this to your desired file
 FLOATING_WINDOW_CHECKER_PATH = f"{CONFIGURATION}/floating_window_checker.txt"
 TIME_CSV_PATH = f"{CONFIGURATION}/time.csv"
 CONFIGURATION_PATH = f"{CONFIGURATION}/configuration.csv"
+TIMERS_CSV_PATH = f"{CONFIGURATION}/timers.csv"
+PHASE_HISTORY_PATH = f"{CONFIGURATION}/phase_history.bin"
+STATUS_JSON_PATH = f"{CONFIGURATION}/status.json"
 
 NEW_WORK_SOUND_PATH = f"{AUDIOS}/new_work.mp3"
 WORK_SOUND_PATH = f"{AUDIOS}/work.mp3"
@@ -221,6 +235,24 @@ except:
         writer.writerow([25, 5, 20, FALSE])
         print("afrojack")
 # ----------------------------- TIMER CONFIGS ------------------------------- #
+TRUE_WORDS = ["true", "1", "yes", "correct"]
+
+def parse_flag(value):
+    return str(value).lower() in TRUE_WORDS
+
+def optional_setting(config, column, default, parse, minimum=None):
+    """An optional configuration column; a missing or invalid value only falls back to its own default"""
+    value = config.get(column)
+    if value is None or str(value).strip() == "":
+        return default
+    try:
+        parsed = parse(value)
+    except ValueError:
+        print(f"Invalid {column}={value!r} in the configuration, using {default}")
+        return default
+    return parsed if minimum is None else max(parsed, minimum)
+
+config = {}
 try:
     with open(CONFIGURATION_PATH, "r", newline='') as file:
         reader = csv.DictReader(file)
@@ -228,26 +260,7 @@ try:
         WORK_MIN = int(config["WORK_MIN"])
         SHORT_BREAK_MIN = int(config["SHORT_BREAK_MIN"])
         LONG_BREAK_MIN = int(config["LONG_BREAK_MIN"])
-        NOTEPAD_MODE = int(config["NOTEPAD_MODE"].lower() in ["true", "1", "yes", "correct"])
-
-        # Theme Integration: Override constants if theme columns exist
-        if "THEME_TEXT" in config:
-            BLACK = config["THEME_TEXT"]
-            WHITE = config["THEME_BG"]
-            ORANGE = config["THEME_ACCENT"]
-            TOMATO_COLOR = config["THEME_ACCENT"]
-
-            # Update dependent constants
-            BUTTON_BACKGROUND_COLOR = BLACK
-            BUTTON_FOREGROUND_COLOR = WHITE
-            SWITCH_BUTTON_DARK_BG_COLOR = BLACK
-            SWITCH_BUTTON_DARK_FG_COLOR = WHITE
-            SWITCH_BUTTON_LIGHT_BG_COLOR = WHITE
-            SWITCH_BUTTON_LIGHT_FG_COLOR = BLACK
-            RADIO_FOREGROUND_COLOR = BLACK
-            
-            print(f"Theme loaded: Text={BLACK}, Bg={WHITE}, Accent={ORANGE}")
-
+        NOTEPAD_MODE = int(config["NOTEPAD_MODE"].lower() in TRUE_WORDS)
 except Exception as e:
     # Fallback to defaults if reading fails
     WORK_MIN = 25
@@ -256,6 +269,38 @@ except Exception as e:
     NOTEPAD_MODE = False
     print(f"Could not load configuration, using defaults: {e}")
 
+# Optional columns, each parsed on its own so a bad value can't reset the ones above
+# Stopwatch auto-pauses after this many idle minutes (0 disables)
+IDLE_THRESHOLD_MIN = optional_setting(config, "IDLE_THRESHOLD_MIN", 5, float, minimum=0)
+IDLE_SUBTRACT = optional_setting(config, "IDLE_SUBTRACT", True, parse_flag)
+# Pomodoro progress ring
+PROGRESS_RING = optional_setting(config, "PROGRESS_RING", True, parse_flag)
+PROGRESS_RING_FPS = optional_setting(config, "PROGRESS_RING_FPS", 20, int, minimum=1)
+LOW_POWER = optional_setting(config, "LOW_POWER", False, parse_flag)
+# Snapshot the data files every N minutes (0 disables)
+SNAPSHOT_INTERVAL_MIN = optional_setting(config, "SNAPSHOT_INTERVAL_MIN", 0, float, minimum=0)
+# Local heatmap SVG (and PNG) rebuilt after every save
+HEATMAP = optional_setting(config, "HEATMAP", True, parse_flag)
+HEATMAP_PNG = optional_setting(config, "HEATMAP_PNG", False, parse_flag)
+
+# Theme Integration: Override constants if theme columns exist
+if config.get("THEME_TEXT") and config.get("THEME_BG") and config.get("THEME_ACCENT"):
+    BLACK = config["THEME_TEXT"]
+    WHITE = config["THEME_BG"]
+    ORANGE = config["THEME_ACCENT"]
+    TOMATO_COLOR = config["THEME_ACCENT"]
+
+    # Update dependent constants
+    BUTTON_BACKGROUND_COLOR = BLACK
+    BUTTON_FOREGROUND_COLOR = WHITE
+    SWITCH_BUTTON_DARK_BG_COLOR = BLACK
+    SWITCH_BUTTON_DARK_FG_COLOR = WHITE
+    SWITCH_BUTTON_LIGHT_BG_COLOR = WHITE
+    SWITCH_BUTTON_LIGHT_FG_COLOR = BLACK
+    RADIO_FOREGROUND_COLOR = BLACK
+    
+    print(f"Theme loaded: Text={BLACK}, Bg={WHITE}, Accent={ORANGE}")
+
 reps = 1
 resume = 0
 start_timer_checker = 0
@@ -286,9 +331,17 @@ start_short_break= False
 start_long_break = False
 open_floating_window = False
 start_timer_checker_2 = False 
+idle_paused = False
+IDLE_RESUME_CHECK_MS = 500
+phase_clock = PhaseClock()
+phase_tick_at = 0.0
+MAIN_RING_BBOX = (35, 65, 165, 195)
+FLOATING_RING_BBOX = (110, 150, 230, 270)
 # -------------------------- CONECTION WITH PIXELA ------------------------------- #
-def connect_to_pixela():
-    global hours
+def connect_to_pixela(quantity=None):
+    requests = _lazy_import_requests()
+    if quantity is None:
+        quantity = hours
     params = {
         "color": "momiji",
         "token": TOKEN,
@@ -316,14 +369,14 @@ def connect_to_pixela():
     add_pixel_endpoint = f"{PIXELA_ENDPOINT}/{USERNAME}/graphs/{GRAPH_ID}"
     pixels_params = {
         "date": DATE,
-        "quantity": str(hours),
+        "quantity": str(quantity),
     }
     pixel_response = requests.post(url=add_pixel_endpoint, json=pixels_params, headers=headers)
     print(pixel_response.text)
     print(len(pixel_response.text))
     update_pixel_endpoint = f"{PIXELA_ENDPOINT}/{USERNAME}/graphs/{GRAPH_ID}/{DATE}"
     update_pixel_params = {
-        "quantity": str(hours),
+        "quantity": str(quantity),
     }
     # Updates the pixel quantity
     update_pixel_response = requests.put(url=update_pixel_endpoint, json=update_pixel_params, headers=headers)
@@ -336,13 +389,12 @@ def connect_to_pixela():
     if len(pixel_response.text) == 341:
         print("Trying to connect to Pixela again...")
         time.sleep(0.5)
-        start_multithread(connect_to_pixela)
+        connect_to_pixela(quantity)
 # ----------------------------MODS---------------------------- #
 def pomodoro_mode():
     global pomodoro_mode_activate, crono_mode_activate, hours, minute, second, reset_pass
     if crono_mode_activate:
-        with open(TIME_CSV_PATH, mode='a') as file:
-            file.write(f"{hours},{minute},{second}\n")
+        append_record(TIME_CSV_PATH, f"{hours},{minute},{second}")
     reset_pass = True
     reset()
     reset_pass = False
@@ -355,19 +407,18 @@ def pomodoro_mode():
 def crono_mode():
     global crono_mode_activate, pomodoro_mode_activate, second, minute, hours, show_hours, crono_reset,reset_pass
     if crono_mode_activate:
-        with open(TIME_CSV_PATH, mode='a') as file:
-            file.write(f"{hours},{minute},{second}\n")
+        append_record(TIME_CSV_PATH, f"{hours},{minute},{second}")
     reset_pass = True
     reset()
     reset_pass = False
     crono_mode_activate = True
     pomodoro_mode_activate = False
 
-    # Gets the time from the time file
-    df = pd.read_csv(TIME_CSV_PATH)
-    second = df['second'].iloc[-1]
-    minute = df['minute'].iloc[-1]
-    hours = df['hours'].iloc[-1]
+    # Gets the time from the time file (last complete row, a half-written one is skipped)
+    last = last_session(TIME_CSV_PATH) or {"hours": 0, "minute": 0, "second": 0}
+    second = last['second']
+    minute = last['minute']
+    hours = last['hours']
     if int(hours) != 0:
         show_hours = True
 
@@ -405,6 +456,7 @@ def reset():
         reset_pass, pause_pomodoro_mode
     if reset_pass or askyesno("Reset Timer", "Are you sure you want to reset the timer?"):
         if pomodoro_mode_activate:
+            end_phase(INTERRUPTED)
             try:
                 root.after_cancel(count_downer)
             except Exception as e:
@@ -427,14 +479,62 @@ def reset():
         condition_checker = True
         show_hours = False
         pause_pomodoro_mode = False
+        phase_clock.total = 0
         pause_button.config(text=f"Pause")
         canvas.itemconfig(timer, text="00:00", font=(FONT_NAME, MAIN_MINUTE_FONT_SIZE, "bold"))
         floating_timer_label.config(text="00:00", font=(FONT_NAME, FLOATING_MINUTE_FONT_SIZE, "bold"))
         floating_timer_label.place(x=MINUTE_X, y=MINUTE_Y)
     
+# ---------------------------- IDLE DETECTION ------------------------------- #
+def start_idle_monitor():
+    """Start the input sampler thread, None if idle detection is off or unsupported"""
+    if IDLE_THRESHOLD_MIN <= 0:
+        return None
+    loaders = (lambda: (_lazy_import_pyautogui(), _lazy_import_keyboard()),)
+    source = default_source(loaders)
+    if source is None:
+        print("Idle detection disabled: no input source available")
+        return None
+    monitor = IdleMonitor(source, threshold=IDLE_THRESHOLD_MIN * 60)
+    monitor.start()
+    print(f"Idle detection: {source.name}, threshold {IDLE_THRESHOLD_MIN} min")
+    return monitor
+
+def subtract_crono_seconds(amount):
+    """Take `amount` seconds off the stopwatch (the idle span it counted before pausing)"""
+    global hours, minute, second, show_hours
+    hours, minute, second = subtract_idle(hours, minute, second, amount)
+    show_hours = hours != 0
+
+def idle_auto_pause():
+    global idle_paused
+    idle_paused = True
+    if IDLE_SUBTRACT:
+        subtract_crono_seconds(idle_monitor.idle_seconds)
+    pause_timer()
+    timer_label.config(text="Idle", fg=BLACK)
+    root.after(IDLE_RESUME_CHECK_MS, idle_auto_resume)
+
+def idle_auto_resume():
+    global idle_paused
+    if not idle_paused:
+        return
+    # The user resumed, reset or switched mode by hand in the meantime
+    if not crono_mode_activate or resume != 1:
+        idle_paused = False
+        return
+    if idle_monitor.is_idle:
+        root.after(IDLE_RESUME_CHECK_MS, idle_auto_resume)
+        return
+    idle_paused = False
+    pause_timer()
+
 # ---------------------------- CRONOMETER MECHANISM ------------------------------- #
 def crono():
     global count_upper, second, minute, hours, show_hours, start_timer_checker_2
+    if idle_monitor is not None and idle_monitor.is_idle and not idle_paused:
+        idle_auto_pause()
+        return
     timer_label.config(text="WORK", fg=BLACK)
     if not start_timer_checker_2:
         second +=1 
@@ -473,7 +573,7 @@ def start_timer():
             short_break_sec = SHORT_BREAK_MIN * 60
             long_break_sec = LONG_BREAK_MIN * 60
             if reps % 8 == 0:
-                LONG_BREAK_SOUND.play()
+                publish_phase_started("long_break", long_break_sec)
                 temp = condition_checker
                 condition_checker = False
                 start_long_break = True
@@ -490,16 +590,17 @@ def start_timer():
                 reps = 1
             elif reps % 2 == 1:
                 if reps == 1 and not long_break_pause:
+                    publish_phase_started("work", work_sec)
                     check_mark.config(text="")
                     timer_label.config(text="Work", fg=BLACK)
                     count_down(work_sec)
                 else:
                     if long_break_pause:
-                        NEW_WORK_SOUND.play()
+                        publish_phase_started("new_work", work_sec)
                         long_break_pause = False
                         check_mark.config(text="")
                     else:
-                        WORK_SOUND.play()
+                        publish_phase_started("work", work_sec)
                     pause_pomodoro() 
                     temp_work_sec = work_sec # Export to pause_timer's global
                 reps += 1
@@ -514,7 +615,7 @@ def start_timer():
                 elif reps == 6:
                     check_mark.config(text="✔✔✔")
                     check_mark.place(x=70, y=290)
-                BREAK_SOUND.play()
+                publish_phase_started("short_break", short_break_sec)
                 temp = condition_checker
                 condition_checker = False
                 start_short_break = True
@@ -536,7 +637,9 @@ def start_timer():
 
 
 def count_down(count):
-    global second, minute, count_downer, start_timer_checker
+    global second, minute, count_downer, start_timer_checker, phase_tick_at
+    phase_clock.tick(count)  # The first tick is when the phase really starts
+    phase_tick_at = time.monotonic()
     second = count % 60
     minute = math.floor(count / 60)
     second_int = count % 60
@@ -552,6 +655,7 @@ def count_down(count):
         count_downer = root.after(1000, count_down, count - 1)
     else:
         start_timer_checker = 0
+        end_phase(COMPLETED)
         start_timer()
 
 def pause_timer():
@@ -563,6 +667,7 @@ def pause_timer():
         timer_label.config(text="Work", fg=BLACK) 
         pause_button.config(text=f"Pause")
         count_down(temp_work_sec)
+        event_bus.publish(Paused("pomodoro", False))
     elif pomodoro_mode_activate:
         if not condition_checker:
             root.after_cancel(count_downer)
@@ -593,6 +698,7 @@ def pause_timer():
                 else:
                     count_down(minute * 60 + second)
                     timer_label.config(text="Work", fg=BLACK)
+            event_bus.publish(Paused("pomodoro", paused))
 
     elif crono_mode_activate:
         if not condition_checker:
@@ -620,6 +726,7 @@ def pause_timer():
                 timer_label.config(text="WORK", fg=BLACK)
                 pause_button.config(text=f"Pause")
                 count_upper = root.after(1000, crono)
+            event_bus.publish(Paused("stopwatch", paused))
     else:
         print("Error: No mode selected")
 
@@ -643,8 +750,6 @@ def save_data():
         pause_timer()
     if crono_mode_activate:
         crono_reset = False
-        with open(TIME_CSV_PATH, mode='a') as file:
-            file.write(f"{hours},{minute},{second}\n")
 
         if show_hours:
             if not NOTEPAD_MODE:
@@ -662,40 +767,17 @@ def save_data():
                     pass
                 else: 
                     showinfo("Your note:", '{}'.format(saved_note))
-        try:
-            if note_writer_first_gap == 0:
-                note_writer_first = "\n"
-            else:
-                note_writer_first = "\n\n"
-            note_writer_first_gap = None
-            with open(SAVE_FILE_NAME, 'a', encoding='utf-8') as file:
-                if not show_hours:
-                    file.write(
-                        f"{note_writer_first}{dt.datetime.now().strftime('%m/%d/%Y')}\n{minute:02d}:{second:02d}")
-                    if saved_note:
-                        file.write(f" {saved_note}")
-                else: 
-                    file.write(
-                        f"{note_writer_first}{dt.datetime.now().strftime('%m/%d/%Y')}\n{hours:02d}:{minute:02d}:{second:02d}")
-                    if saved_note:
-                        file.write(f" {saved_note}")
-            time.sleep(0.03)
-            open_in_notepad(SAVE_FILE_NAME)
-        except e:
-            print(e)
+        if note_writer_first_gap == 0:
+            note_writer_first = "\n"
+        else:
+            note_writer_first = "\n\n"
+        note_writer_first_gap = None
+        # Files, Notepad and Pixela are handled by the event bus subscribers (see EVENT BUS)
+        event_bus.publish(SessionSaved(int(hours), int(minute), int(second), show_hours, saved_note or "",
+                                       note_writer_first, dt.datetime.now().strftime('%m/%d/%Y')))
     else:
         tkinter.messagebox.showerror("Error", "You need to be in stopwatch mode to use save button.")
 
-    try:
-        if crono_mode_activate:
-            start_multithread(connect_to_pixela)
-    except requests.exceptions.ConnectionError:
-        print("Connection Error: Unable to connect to Pixela.")
-        time.sleep(1)
-        start_multithread(connect_to_pixela)
-    except Exception as e:
-        print(f"An error occurred: {e}")
-
 def start_multithread(function):
     thread = threading.Thread(target=function)
     thread.start()
@@ -711,12 +793,115 @@ def center_window(window):
     window.geometry(f"{width}x{height}+{x}+{y}")
 
 def on_closing():
+    if idle_monitor is not None:
+        idle_monitor.stop()
+    if snapshot_job is not None:
+        snapshot_job.set()
+    timer_scheduler.save()
     if not pomodoro_mode_activate:
-        with open(TIME_CSV_PATH, mode='a') as file:
-            file.write(f"{hours},{minute},{second}\n")
+        append_record(TIME_CSV_PATH, f"{hours},{minute},{second}")
+    else:
+        end_phase(INTERRUPTED)
+    event_bus.close()  # Let queued saves reach the disk
+    print(f"Event bus: {event_bus.metrics()}")
     cleanup_lock_file()  # Clean up lock file before exit
     root.destroy()
+# ---------------------------- EVENT BUS ------------------------------- #
+# Side effects of phase changes and saves run on the subscribers' own threads, so none of them
+# can stall a tick. Subscribers must not touch Tk widgets.
+PHASE_SOUNDS = {"new_work": "new_work", "work": "work", "short_break": "break", "long_break": "long_break"}
+
+def publish_phase_started(phase, duration_seconds):
+    phase_clock.offer("work" if phase == "new_work" else phase, duration_seconds, reps)
+    event_bus.publish(PhaseStarted("pomodoro", phase, reps, duration_seconds))
+
+def end_phase(outcome):
+    """Publish PhaseEnded for the current Pomodoro phase, if there is one. A phase whose countdown
+    never began (reset, mode switch or closing while it waited for Resume) is recorded as skipped."""
+    ended = phase_clock.end(outcome)
+    if ended:
+        event_bus.publish(PhaseEnded("pomodoro", *ended))
+
+def play_phase_sound(event):
+    # The very first work block of a cycle starts silently
+    if event.phase == "work" and event.reps == 1:
+        return
+    play_sound(PHASE_SOUNDS[event.phase])
+
+def persist_session(event):
+    append_record(TIME_CSV_PATH, f"{event.hours},{event.minute},{event.second}")
+    # The whole entry goes out in one append so KeganOS never sees half of it
+    if not event.show_hours:
+        entry = f"{event.separator}{event.date}\n{event.minute:02d}:{event.second:02d}"
+    else:
+        entry = f"{event.separator}{event.date}\n{event.hours:02d}:{event.minute:02d}:{event.second:02d}"
+    if event.note:
+        entry += f" {event.note}"
+    append_record(SAVE_FILE_NAME, entry, terminate=False)
+    event_bus.publish(DataWritten(SAVE_FILE_NAME))
+
+def show_saved_journal(event):
+    if event.path != SAVE_FILE_NAME:
+        return
+    try:
+        open_in_notepad(SAVE_FILE_NAME)
+    except Exception as e:
+        print(e)
+
+def refresh_heatmap(event=None):
+    """Re-render the local heatmap from the journal (only the new part of it is read)"""
+    if not HEATMAP:
+        return
+    try:
+        heatmap.refresh(png=HEATMAP_PNG)
+    except Exception as e:
+        print(f"Could not render the heatmap: {e}")
+
+def record_phase(event):
+    if event.mode != "pomodoro":
+        return  # Named timers keep their own state in timers.csv
+    phase_history.append(event.started_at, event.planned_seconds, event.actual_seconds, event.phase,
+                         event.outcome, event.reps)
+    if event.phase == "work":
+        event_bus.publish(DataWritten(PHASE_HISTORY_PATH))
+
+def send_session_to_pixela(event):
+    requests = _lazy_import_requests()
+    try:
+        connect_to_pixela(event.hours)
+    except requests.exceptions.ConnectionError:
+        print("Connection Error: Unable to connect to Pixela.")
+        time.sleep(1)
+        connect_to_pixela(event.hours)
+
+def write_status(event):
+    """Latest timer state for other processes (KeganOS) in status.json"""
+    status = {"event": type(event).__name__, "updated_at": dt.datetime.now().isoformat(timespec="seconds")}
+    status.update(vars(event))
+    temp_path = f"{STATUS_JSON_PATH}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(status, file)
+    os.replace(temp_path, STATUS_JSON_PATH)
+
+def log_event(event):
+    print(f"[event] {event}")
+
+phase_history = PhaseHistory(PHASE_HISTORY_PATH)
+event_bus = EventBus()
+event_bus.subscribe("audio", play_phase_sound, PhaseStarted, maxsize=4, policy=DROP_OLDEST)
+# Persistence never drops an event and never makes the publisher wait
+event_bus.subscribe("persistence", persist_session, SessionSaved, maxsize=256, policy=KEEP_ALL)
+event_bus.subscribe("phase_history", record_phase, PhaseEnded, maxsize=256, policy=KEEP_ALL)
+# Run once the data is on disk; a queued heatmap refresh already covers every write before it
+event_bus.subscribe("heatmap", refresh_heatmap, DataWritten, maxsize=1, policy=DROP_OLDEST)
+event_bus.subscribe("notepad", show_saved_journal, DataWritten, maxsize=4, policy=DROP_OLDEST)
+event_bus.subscribe("pixela", send_session_to_pixela, SessionSaved, maxsize=8, policy=DROP_OLDEST)
+event_bus.subscribe("ipc", write_status, PhaseStarted, PhaseEnded, Paused, SessionSaved, maxsize=16, policy=DROP_OLDEST)
+event_bus.subscribe("instrumentation", log_event, PhaseStarted, PhaseEnded, Paused, SessionSaved, maxsize=256, policy=DROP_OLDEST)
 # ---------------------------- UI SETUP ------------------------------- #
+idle_monitor = start_idle_monitor()
+snapshot_job = start_snapshot_job(SNAPSHOT_INTERVAL_MIN) if SNAPSHOT_INTERVAL_MIN > 0 else None
+threading.Thread(target=refresh_heatmap, name="Heatmap", daemon=True).start()  # New day, or KeganOS wrote entries
 root = Tk()
 root.title("KEGOMODORO")
 root.config(padx=100, pady=50, bg=DARK_RED)
@@ -756,13 +941,15 @@ class DraggableWindow(Toplevel):
         
         # Load the image and keep a reference to it
         self.image = ImageTk.PhotoImage(Image.open(FLOATING_IMAGE_PATH))
-        label = Label(self, image=self.image, bg='white', highlightthickness=0) #! Adjust the frame color of image
+        # A canvas rather than a Label so the progress ring can be drawn over the image
+        self.canvas = Canvas(self, width=self.image.width(), height=self.image.height(), bg='white', highlightthickness=0) #! Adjust the frame color of image
+        self.image_item = self.canvas.create_image(0, 0, image=self.image, anchor="nw")
         self.overrideredirect(True)
         self.geometry("+250+250")
         self.lift()
         self.wm_attributes("-topmost", True)
         self.wm_attributes("-transparentcolor", "white")
-        label.pack()
+        self.canvas.pack()
 
         self.start_x = 0
         self.start_y = 0
@@ -798,6 +985,9 @@ floating_timer_label = Label(window, text="00:00", font=(FONT_NAME, FLOATING_MIN
 floating_timer_label.pack()
 floating_timer_label.place(x=MINUTE_X, y=MINUTE_Y)
 
+# Focused named timer (see TIMERS WINDOW)
+floating_named_label = Label(window, text="", font=(FONT_NAME, 11, "bold"), foreground=WHITE, bg=DEEP_RED)
+
 # KEGAN Software signature
 logo = Canvas(width=600, height=224, bg=DARK_RED, highlightthickness=0)
 logo_img = PhotoImage(file=LOGO_IMAGE_PATH)
@@ -808,7 +998,7 @@ logo.place(x=-300, y=230)
 # Main image
 canvas = Canvas(width=200, height=240, bg=DARK_RED, highlightthickness=0)
 tomato_img = PhotoImage(file=MAIN_IMAGE_PATH)
-canvas.create_image(100, 120, image=tomato_img) #? IT'S CENTER THE IMAGE
+main_image_item = canvas.create_image(100, 120, image=tomato_img) #? IT'S CENTER THE IMAGE
 timer = canvas.create_text(100, 130, text="00:00", font=(FONT_NAME, MAIN_MINUTE_FONT_SIZE, "bold"), fill="white")
 canvas.grid(column=1, row=1)
 
@@ -868,6 +1058,160 @@ radiobutton2 = Radiobutton(text="Stopwatch", value=2, variable=radio_state, comm
 radiobutton1.place(x=200, y=-20) 
 radiobutton2.place(x=200, y=-0)
 
+# ---------------------------- TIMERS WINDOW ------------------------------- #
+class TimersWindow(Toplevel):
+    """Manage the named timers that run next to the main one"""
+    def __init__(self, scheduler):
+        super().__init__()
+        self.title("Timers")
+        self.config(padx=10, pady=10, bg=DARK_RED)
+        self.resizable(False, False)
+        self.scheduler = scheduler
+
+        self.listbox = Listbox(self, width=36, height=10, font=(FONT_NAME, 11, "bold"), activestyle="none")
+        self.listbox.grid(column=0, row=0, columnspan=5)
+
+        self.name_entry = Entry(self, width=20)
+        self.name_entry.grid(column=0, row=1, columnspan=2, pady=5)
+        self.kind_state = StringVar(value=STOPWATCH)
+        for column, kind in enumerate(KINDS, start=2):
+            Radiobutton(self, text=kind.capitalize(), value=kind, variable=self.kind_state,
+                        background=RADIO_BACKGROUND_COLOR, foreground=RADIO_FOREGROUND_COLOR,
+                        activebackground=RADIO_BACKGROUND_COLOR, activeforeground=RADIO_FOREGROUND_COLOR).grid(column=column, row=1)
+        Button(self, text="Add", command=self.add, background=BUTTON_BACKGROUND_COLOR, foreground=BUTTON_FOREGROUND_COLOR).grid(column=4, row=1)
+
+        for column, (text, command) in enumerate((("Start/Pause", self.scheduler.toggle), ("Reset", self.scheduler.reset),
+                                                  ("Focus", self.focus_timer), ("Remove", self.scheduler.remove))):
+            Button(self, text=text, command=lambda command=command: self.on_selected(command),
+                   background=BUTTON_BACKGROUND_COLOR, foreground=BUTTON_FOREGROUND_COLOR).grid(column=column, row=2, pady=5)
+        self.refresh(scheduler)
+
+    def selected(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            return None
+        return list(self.scheduler.timers)[selection[0]]
+
+    def on_selected(self, command):
+        name = self.selected()
+        if name is None:
+            tkinter.messagebox.showerror("Timers", "Select a timer first!", parent=self)
+            return
+        command(name)
+
+    def focus_timer(self, name):
+        # Focusing the focused timer again hides it from the floating window
+        self.scheduler.focus(None if self.scheduler.focused == name else name)
+
+    def add(self):
+        try:
+            self.scheduler.add(self.name_entry.get().strip(), self.kind_state.get(), work_min=WORK_MIN,
+                               short_break_min=SHORT_BREAK_MIN, long_break_min=LONG_BREAK_MIN)
+        except ValueError as e:
+            tkinter.messagebox.showerror("Timers", str(e), parent=self)
+            return
+        self.name_entry.delete(0, END)
+
+    def refresh(self, scheduler):
+        if not self.winfo_exists():
+            return
+        selection = self.listbox.curselection()
+        now = scheduler.clock()
+        self.listbox.delete(0, END)
+        for timer in scheduler.timers.values():
+            state = "▶" if timer.running else "⏸"
+            focus = "*" if timer.name == scheduler.focused else " "
+            phase = f" [{timer.phase}]" if timer.kind != STOPWATCH else ""
+            self.listbox.insert(END, f"{focus}{state} {timer.name}: {timer.display(now)}{phase}")
+        if selection and selection[0] < self.listbox.size():
+            self.listbox.selection_set(selection[0])
+
+timers_window = None
+
+def open_timers_window():
+    global timers_window
+    if timers_window is not None and timers_window.winfo_exists():
+        timers_window.lift()
+        return
+    timers_window = TimersWindow(timer_scheduler)
+
+def on_named_timers_display(scheduler):
+    text = scheduler.focused_text()
+    if text:
+        floating_named_label.config(text=text)
+        floating_named_label.place(x=MINUTE_X - 10, y=MINUTE_Y + 45)
+    else:
+        floating_named_label.place_forget()
+    if timers_window is not None and timers_window.winfo_exists():
+        timers_window.refresh(scheduler)
+
+def on_named_timer_phase(timer):
+    phase = "new_work" if timer.phase == WORK and timer.reps == 1 else timer.phase
+    event_bus.publish(PhaseStarted(f"timer:{timer.name}", phase, timer.reps, timer.phase_length()))
+
+timer_scheduler = TimerScheduler(root, TIMERS_CSV_PATH)
+timer_scheduler.load()
+timer_scheduler.on_display(on_named_timers_display)
+timer_scheduler.on_phase(on_named_timer_phase)
+on_named_timers_display(timer_scheduler)
+
+timers_button = Button(text="Timers", highlightthickness=0, command=open_timers_window,
+                       background=BUTTON_BACKGROUND_COLOR, foreground=BUTTON_FOREGROUND_COLOR,
+                       activebackground=BUTTON_BACKGROUND_COLOR, activeforeground=BUTTON_FOREGROUND_COLOR)
+timers_button.place(x=200, y=45)
+
+# ---------------------------- LIVE THEMING ------------------------------- #
+def update_theme_constants(old_theme, new_theme):
+    """Keep the module constants in sync so runtime .config(fg=BLACK) calls use the new theme"""
+    global BLACK, WHITE, ORANGE, TOMATO_COLOR, BUTTON_BACKGROUND_COLOR, BUTTON_FOREGROUND_COLOR, \
+        SWITCH_BUTTON_DARK_BG_COLOR, SWITCH_BUTTON_DARK_FG_COLOR, SWITCH_BUTTON_LIGHT_BG_COLOR, \
+        SWITCH_BUTTON_LIGHT_FG_COLOR, RADIO_FOREGROUND_COLOR
+    BLACK = new_theme.text
+    WHITE = new_theme.bg
+    ORANGE = new_theme.accent
+    TOMATO_COLOR = new_theme.accent
+    BUTTON_BACKGROUND_COLOR = BLACK
+    BUTTON_FOREGROUND_COLOR = WHITE
+    SWITCH_BUTTON_DARK_BG_COLOR = BLACK
+    SWITCH_BUTTON_DARK_FG_COLOR = WHITE
+    SWITCH_BUTTON_LIGHT_BG_COLOR = WHITE
+    SWITCH_BUTTON_LIGHT_FG_COLOR = BLACK
+    RADIO_FOREGROUND_COLOR = BLACK
+    print(f"Theme swapped: Text={BLACK}, Bg={WHITE}, Accent={ORANGE}")
+
+theme_engine = ThemeEngine(root, read_theme(CONFIGURATION_PATH) or Theme(BLACK, WHITE, ORANGE))
+theme_engine.on_change(update_theme_constants)
+for themed_button in (start_button, pause_button, reset_button, save_button, timers_button):
+    theme_engine.register(themed_button, background=TEXT, foreground=BG, activebackground=TEXT, activeforeground=BG)
+for themed_radio in (checkbutton, radiobutton1, radiobutton2):
+    theme_engine.register(themed_radio, foreground=TEXT, activeforeground=TEXT)
+theme_engine.register(floating_timer_label, foreground=BG)
+theme_engine.register(floating_named_label, foreground=BG)
+theme_engine.track(timer_label, "fg")
+theme_engine.track(check_mark, "fg")
+theme_engine.register_image(canvas, MAIN_IMAGE_PATH, item=main_image_item)
+theme_engine.register_image(window.canvas, FLOATING_IMAGE_PATH, item=window.image_item)
+theme_engine.watch(CONFIGURATION_PATH)
+
+# ---------------------------- PROGRESS RING ------------------------------- #
+def pomodoro_progress():
+    """How far the current Pomodoro phase is (0..1), smoothed between the 1 s ticks; None outside Pomodoro"""
+    if not pomodoro_mode_activate or phase_clock.total <= 0:
+        return None
+    since_tick = 0 if paused or pause_pomodoro_mode else min(time.monotonic() - phase_tick_at, 1.0)
+    return (phase_clock.total - phase_clock.remaining + since_tick) / phase_clock.total
+
+progress_rings = []
+if PROGRESS_RING:
+    power_state = PowerState(forced_low_power=LOW_POWER)
+    progress_rings.append(ProgressRing(root, canvas, MAIN_RING_BBOX, pomodoro_progress, ORANGE,
+                                       fps=PROGRESS_RING_FPS, power=power_state, below=timer))
+    progress_rings.append(ProgressRing(root, window.canvas, FLOATING_RING_BBOX, pomodoro_progress, ORANGE,
+                                       fps=PROGRESS_RING_FPS, power=power_state))
+    for ring in progress_rings:
+        theme_engine.register_item(ring.canvas, ring.item, outline=ACCENT)
+        ring.start()
+
 # Floating timer will remeber the mode
 window.withdraw()
 try:
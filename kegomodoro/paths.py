@@ -0,0 +1,20 @@
+"""Absolute paths to KEGOMODORO's data files, for the tools that run outside main.py.
+
+main.py chdirs into its own folder and uses relative paths; these match them.
+"""
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEPENDENCIES = os.path.join(BASE_DIR, "dependencies")
+IMAGES = os.path.join(DEPENDENCIES, "images")
+TEXTS = os.path.join(DEPENDENCIES, "texts")
+CONFIGURATION = os.path.join(TEXTS, "Configurations")
+
+SAVE_FILE_NAME = os.path.join(TEXTS, "KAÆ[Æß#.txt")
+TIME_CSV_PATH = os.path.join(CONFIGURATION, "time.csv")
+CONFIGURATION_PATH = os.path.join(CONFIGURATION, "configuration.csv")
+FLOATING_WINDOW_CHECKER_PATH = os.path.join(CONFIGURATION, "floating_window_checker.txt")
+TIMERS_CSV_PATH = os.path.join(CONFIGURATION, "timers.csv")
+EXPORT_WATERMARK_PATH = os.path.join(CONFIGURATION, "export_watermark.json")
+PHASE_HISTORY_PATH = os.path.join(CONFIGURATION, "phase_history.bin")
+HEATMAP_DIR = os.path.join(DEPENDENCIES, "heatmap")
@@ -0,0 +1,277 @@
+"""Fixed-size binary log of every Pomodoro phase.
+
+phase_history.bin is a 16 byte header (magic, version, record size, record count)
+followed by 24 byte records:
+
+    started_at   float64  unix time the phase started
+    planned      uint32   seconds the phase was set to
+    actual       uint32   seconds actually counted down
+    phase        uint8    index into PHASES
+    outcome      uint8    index into OUTCOMES
+    cycle        uint16   reps when the phase started
+
+The file grows in blocks and is written through mmap: the record goes in first and
+the count in the header last, so a reader never sees half a record. Loading never
+unpacks records one by one: every field is cut out of the mapped file with strided
+byte slices straight into an array, so millions of records load in well under a second.
+
+    python phase_history.py             # summary
+    python phase_history.py --bench 2000000
+"""
+import argparse
+import bisect
+import datetime as dt
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+from itertools import compress
+
+from paths import PHASE_HISTORY_PATH
+from shared_append import FileLock
+
+MAGIC = b"KGPH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+RECORD = struct.Struct("<dIIBBH4x")
+GROW_RECORDS = 4096         # file grows this many records at a time
+READ_BLOCK = 65536          # records loaded at a time when streaming
+
+PHASES = ("work", "short_break", "long_break")
+COMPLETED = "completed"
+SKIPPED = "skipped"
+INTERRUPTED = "interrupted"
+OUTCOMES = (COMPLETED, SKIPPED, INTERRUPTED)
+
+Columns = namedtuple("Columns", "started_at planned actual phase outcome cycle")
+# (byte offset in the record, array typecode) per column; uint32 is "I" or "L" depending on the platform
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+FIELDS = ((0, "d"), (8, _UINT32), (12, _UINT32), (16, "B"), (17, "B"), (18, "H"))
+
+
+def _column(mapped, start, end, offset, typecode):
+    """One field of the records in mapped[start:end] as an array, copied out with strided slices
+    (no per-record Python work)"""
+    width = array(typecode).itemsize
+    packed = bytearray((end - start) // RECORD.size * width)
+    for byte in range(width):
+        packed[byte::width] = mapped[start + offset + byte:end:RECORD.size]
+    column = array(typecode)
+    column.frombytes(packed)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class PhaseHistory:
+    def __init__(self, path=PHASE_HISTORY_PATH):
+        self.path = path
+
+    # ------------------------------ WRITING ------------------------------ #
+    def _open(self):
+        """File descriptor of the log, created with an empty header if needed"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        if os.fstat(fd).st_size < HEADER.size:
+            os.write(fd, HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+        return fd
+
+    def _read_header(self, buffer):
+        magic, version, record_size, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{self.path} is not a version {VERSION} phase history")
+        return count
+
+    def extend(self, records):
+        """Append (started_at, planned, actual, phase, outcome, cycle) tuples; phase/outcome by name"""
+        rows = [(started_at, planned, max(actual, 0), PHASES.index(phase), OUTCOMES.index(outcome), cycle)
+                for started_at, planned, actual, phase, outcome, cycle in records]
+        if not rows:
+            return 0
+        with FileLock(self.path):
+            fd = self._open()
+            try:
+                with mmap.mmap(fd, HEADER.size) as header:
+                    count = self._read_header(header)
+                needed = HEADER.size + (count + len(rows)) * RECORD.size
+                size = os.fstat(fd).st_size
+                if size < needed:
+                    blocks = -(-(needed - HEADER.size) // (GROW_RECORDS * RECORD.size))
+                    os.ftruncate(fd, HEADER.size + blocks * GROW_RECORDS * RECORD.size)
+                with mmap.mmap(fd, needed) as mapped:
+                    offset = HEADER.size + count * RECORD.size
+                    for row in rows:
+                        RECORD.pack_into(mapped, offset, *row)
+                        offset += RECORD.size
+                    mapped.flush()
+                    HEADER.pack_into(mapped, 0, MAGIC, VERSION, RECORD.size, count + len(rows))
+                    mapped.flush()
+            finally:
+                os.close(fd)
+        return len(rows)
+
+    def append(self, started_at, planned, actual, phase, outcome, cycle):
+        self.extend([(started_at, planned, actual, phase, outcome, cycle)])
+
+    # ------------------------------ READING ------------------------------ #
+    def count(self):
+        try:
+            with open(self.path, "rb") as file:
+                return self._read_header(file.read(HEADER.size))
+        except (OSError, struct.error):
+            return 0
+
+    def load(self, start=0, stop=None):
+        """Columns (arrays) of the records from index `start` up to `stop` (default: all)"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+            return Columns(*(array(typecode) for _, typecode in FIELDS))
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            count = self._read_header(mapped)
+            count = count if stop is None else min(stop, count)
+            first = HEADER.size + min(start, count) * RECORD.size
+            end = HEADER.size + count * RECORD.size
+            return Columns(*(_column(mapped, first, end, offset, typecode) for offset, typecode in FIELDS))
+
+    def iter_records(self, start=0):
+        """Yield (record, index) as dicts with phase/outcome names, loading READ_BLOCK records at a time"""
+        stop = self.count()
+        while start < stop:
+            columns = self.load(start, min(start + READ_BLOCK, stop))
+            for index, (started_at, planned, actual, phase, outcome, cycle) in enumerate(zip(*columns), start):
+                yield {
+                    "started_at": started_at,
+                    "planned_seconds": planned,
+                    "actual_seconds": actual,
+                    "phase": PHASES[phase],
+                    "outcome": OUTCOMES[outcome],
+                    "cycle": cycle,
+                }, index
+            start += READ_BLOCK
+
+    def daily_totals(self, phase="work", start=0, stop=None):
+        """{ISO date: seconds counted in `phase`} for records start..stop, by local date"""
+        columns = self.load(start, stop)
+        started_at = columns.started_at
+        code = PHASES.index(phase)
+        selected = columns.phase.tobytes().translate(bytes(int(index == code) for index in range(256)))
+        totals = {}
+        low = 0
+        while low < len(started_at):
+            # Records are written in time order, so each day is one slice found by bisecting at midnight
+            day = dt.date.fromtimestamp(started_at[low])
+            midnight = dt.datetime.combine(day, dt.time()).timestamp()
+            next_midnight = dt.datetime.combine(day + dt.timedelta(days=1), dt.time()).timestamp()
+            high = bisect.bisect_left(started_at, next_midnight, low)
+            if high == low or min(started_at[low:high]) < midnight or max(started_at[low:high]) >= next_midnight:
+                return self._daily_totals_unordered(columns, selected)  # The clock went backwards somewhere
+            seconds = sum(compress(columns.actual[low:high], selected[low:high]))
+            if seconds:
+                totals[day.isoformat()] = totals.get(day.isoformat(), 0) + seconds
+            low = high
+        return totals
+
+    @staticmethod
+    def _daily_totals_unordered(columns, selected):
+        totals = {}
+        for when, seconds in compress(zip(columns.started_at, columns.actual), selected):
+            day = dt.date.fromtimestamp(when).isoformat()
+            totals[day] = totals.get(day, 0) + seconds
+        return {day: seconds for day, seconds in totals.items() if seconds}
+
+
+class PhaseClock:
+    """The running Pomodoro phase: when it was offered, when its countdown began and what is left of it.
+
+    A phase starts on its first tick, not when it's offered (breaks and later work blocks wait
+    for Resume). One that ends before it ever ticked is recorded as skipped, at its offer time."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.phase = "work"
+        self.reps = 0
+        self.total = 0              # seconds the phase was set to
+        self.remaining = 0
+        self.offered_at = 0.0
+        self.started_at = 0.0       # 0 while the countdown hasn't begun
+        self.pending = False        # offered and not ended yet
+
+    def offer(self, phase, duration_seconds, reps):
+        self.phase = phase
+        self.reps = reps
+        self.total = self.remaining = duration_seconds
+        self.offered_at = self.clock()
+        self.started_at = 0.0
+        self.pending = True
+
+    def tick(self, remaining):
+        self.remaining = remaining
+        if self.pending and not self.started_at:
+            self.started_at = self.clock()
+
+    def end(self, outcome):
+        """(phase, reps, outcome, started_at, planned, actual) of the phase that just ended, None if none was running"""
+        if not self.pending:
+            return None
+        self.pending = False
+        if not self.started_at:
+            return self.phase, self.reps, SKIPPED, self.offered_at, self.total, 0
+        started_at, self.started_at = self.started_at, 0.0
+        return self.phase, self.reps, outcome, started_at, self.total, max(self.total - self.remaining, 0)
+
+
+def iter_phases(path=PHASE_HISTORY_PATH, start_offset=0):
+    """Yield (record, end_offset) in export.py's record shape; offsets are byte offsets into the log"""
+    start = max(start_offset - HEADER.size, 0) // RECORD.size
+    for record, index in PhaseHistory(path).iter_records(start):
+        started = dt.datetime.fromtimestamp(record["started_at"])
+        seconds = record["actual_seconds"]
+        offset = HEADER.size + index * RECORD.size
+        yield {
+            "kind": "phase",
+            "date": started.date().isoformat(),
+            "offset": offset,
+            "hours": seconds // 3600,
+            "minute": seconds // 60 % 60,
+            "second": seconds % 60,
+            "duration_seconds": seconds,
+            "note": f"{record['phase']} {record['outcome']} cycle {record['cycle']} "
+                    f"planned {record['planned_seconds']}s at {started.strftime('%H:%M:%S')}",
+        }, offset + RECORD.size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize the Pomodoro phase history")
+    parser.add_argument("--path", default=PHASE_HISTORY_PATH)
+    parser.add_argument("--bench", type=int, metavar="N", help="Write N synthetic phases to --path and time loading")
+    args = parser.parse_args(argv)
+
+    history = PhaseHistory(args.path)
+    if args.bench:
+        if os.path.exists(args.path):
+            print(f"{args.path} exists, use a scratch --path for the benchmark")
+            return 1
+        started = time.time() - args.bench * 600
+        history.extend((started + index * 600, 1500, 1500 - index % 7, PHASES[index % 3], OUTCOMES[index % 5 % 3],
+                        index % 8 + 1) for index in range(args.bench))
+    try:
+        load_started = time.perf_counter()
+        columns = history.load()
+        loaded = time.perf_counter() - load_started
+        totals_started = time.perf_counter()
+        totals = history.daily_totals()
+        summed = time.perf_counter() - totals_started
+    except ValueError as e:
+        print(e)
+        return 1
+    print(f"{len(columns.started_at)} phases loaded in {loaded * 1000:.0f} ms, "
+          f"daily work totals for {len(totals)} days in {summed * 1000:.0f} ms")
+    for outcome_index, outcome in enumerate(OUTCOMES):
+        print(f"  {outcome}: {columns.outcome.count(outcome_index)}")
+    print(f"  work hours: {sum(totals.values()) / 3600:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
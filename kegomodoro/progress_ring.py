@@ -0,0 +1,159 @@
+"""Pomodoro progress ring for KEGOMODORO's canvases.
+
+The ring is a single canvas arc created once; every frame only changes its `extent`
+(and only when the rounded value moved), so the cost of a frame doesn't grow with the
+length of the session. While the window is hidden/minimized or the machine is in a
+low-power state the ring hides itself and only checks back twice a second.
+
+Run `python progress_ring.py [seconds] [fps]` to benchmark the per-frame cost.
+"""
+import ctypes
+import os
+import sys
+import time
+import tkinter as tk
+
+DEFAULT_FPS = 20
+IDLE_POLL_MS = 500            # how often a hidden/disabled ring checks whether to come back
+POWER_CHECK_SECONDS = 30      # battery saver state is re-read this often
+
+
+# ---------------------------- LOW POWER ------------------------------- #
+class _SystemPowerStatus(ctypes.Structure):
+    _fields_ = [("ACLineStatus", ctypes.c_ubyte), ("BatteryFlag", ctypes.c_ubyte),
+                ("BatteryLifePercent", ctypes.c_ubyte), ("SystemStatusFlag", ctypes.c_ubyte),
+                ("BatteryLifeTime", ctypes.c_ulong), ("BatteryFullLifeTime", ctypes.c_ulong)]
+
+
+def battery_saver_on():
+    """True when Windows battery saver or the Linux "low-power" platform profile is on"""
+    try:
+        if sys.platform == "win32":
+            status = _SystemPowerStatus()
+            if ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+                return status.SystemStatusFlag == 1
+        elif os.path.exists("/sys/firmware/acpi/platform_profile"):
+            with open("/sys/firmware/acpi/platform_profile") as file:
+                return file.read().strip() == "low-power"
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+class PowerState:
+    """Cached battery saver check, so frames don't hit the OS"""
+
+    def __init__(self, forced_low_power=False):
+        self.forced_low_power = forced_low_power
+        self._checked_at = None
+        self._low_power = False
+
+    @property
+    def low_power(self):
+        if self.forced_low_power:
+            return True
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at > POWER_CHECK_SECONDS:
+            self._low_power = battery_saver_on()
+            self._checked_at = now
+        return self._low_power
+
+
+# ---------------------------- RING ------------------------------- #
+class ProgressRing:
+    """One arc item animated by changing its extent
+
+    progress: callable returning 0..1, or None when there's nothing to show
+    """
+
+    def __init__(self, root, canvas, bbox, progress, color, width=6, fps=DEFAULT_FPS, power=None, below=None):
+        self.root = root
+        self.canvas = canvas
+        self.progress = progress
+        self.interval_ms = max(int(1000 / max(fps, 1)), 1)
+        self.power = power or PowerState()
+        self.item = canvas.create_arc(*bbox, start=90, extent=0, style=tk.ARC, outline=color,
+                                      width=width, state=tk.HIDDEN)
+        if below is not None:
+            canvas.tag_lower(self.item, below)  # Keep the timer text readable on top
+        self.frames = 0
+        self.updates = 0
+        self._extent = 0.0
+        self._shown = False
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._frame)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._show(False)
+
+    def active(self):
+        try:
+            return not self.power.low_power and bool(self.canvas.winfo_viewable())
+        except tk.TclError:
+            return False
+
+    def _show(self, shown):
+        if shown != self._shown:
+            self.canvas.itemconfig(self.item, state=tk.NORMAL if shown else tk.HIDDEN)
+            self._shown = shown
+
+    def render(self, fraction):
+        """Draw one frame; returns True if the canvas item had to change"""
+        self.frames += 1
+        if fraction is None:
+            self._show(False)
+            return False
+        fraction = min(max(fraction, 0.0), 1.0)
+        extent = -round(fraction * 359.9, 1)  # Negative = clockwise from 12 o'clock
+        changed = extent != self._extent
+        if changed:
+            self.canvas.itemconfig(self.item, extent=extent)
+            self._extent = extent
+            self.updates += 1
+        self._show(True)
+        return changed
+
+    def _frame(self):
+        fraction = self.progress() if self.active() else None
+        self.render(fraction)
+        delay = self.interval_ms if fraction is not None else IDLE_POLL_MS
+        self._after_id = self.root.after(delay, self._frame)
+
+
+if __name__ == "__main__":
+    # Per-frame cost benchmark: the cost of the last block of frames should match the first
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    fps = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=200, height=240)
+    canvas.pack()
+    started = time.perf_counter()
+    ring = ProgressRing(root, canvas, (35, 65, 165, 195), lambda: (time.perf_counter() - started) / duration % 1,
+                        "#EB5B00", fps=fps, power=PowerState())
+    costs = []
+    item_counts = set()
+
+    def frame():
+        frame_started = time.perf_counter()
+        ring.render(ring.progress())
+        root.update_idletasks()
+        costs.append(time.perf_counter() - frame_started)
+        item_counts.add(len(canvas.find_all()))
+        if time.perf_counter() - started < duration:
+            root.after(ring.interval_ms, frame)
+        else:
+            root.destroy()
+
+    root.after(ring.interval_ms, frame)
+    root.mainloop()
+    block = max(len(costs) // 10, 1)
+    for index in range(0, len(costs) - block + 1, block):
+        chunk = costs[index:index + block]
+        print(f"frames {index:>6}-{index + block:>6}: {sum(chunk) / len(chunk) * 1e6:7.1f}us/frame")
+    print(f"{ring.frames} frames, {ring.updates} item updates, canvas item counts seen: {sorted(item_counts)}")
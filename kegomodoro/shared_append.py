@@ -0,0 +1,213 @@
+"""Append protocol for files written by both KEGOMODORO and KeganOS (time.csv, the notes journal).
+
+Writers:
+  1. Take the advisory lock: create `<file>.lock` exclusively (O_CREAT | O_EXCL) holding
+     "<pid> <random token>", retrying for a short timeout. A lock older than
+     STALE_LOCK_SECONDS is left over from a crash and gets broken: it's renamed aside
+     first and only deleted if the renamed file itself is stale (otherwise another waiter
+     already replaced it with a fresh lock, which is put back).
+  2. If the file doesn't end with a newline (an old writer left an unterminated row),
+     the record is prefixed with one.
+  3. Write the whole record with a single write() on an O_APPEND descriptor.
+  4. Remove the lock file, if it still holds our token.
+  If the lock can't be taken in time the record is still appended (step 2-3) rather than
+  lost; an O_APPEND write of a complete record doesn't interleave with other appends.
+
+Readers (see history.py): a final line without a trailing newline may be a record that
+is still being written. It is only used if it parses as a complete record and nobody
+holds the lock.
+
+KeganOS implements the same steps in Infrastructure/Services/SharedFileAppender.cs.
+
+Run `python shared_append.py [writers] [records]` for the multi-writer stress test.
+"""
+import os
+import time
+import uuid
+
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 0.5          # seconds a writer waits for the lock
+LOCK_RETRY_INTERVAL = 0.005
+STALE_LOCK_SECONDS = 5.0
+_BINARY = getattr(os, "O_BINARY", 0)  # Windows would translate newlines otherwise
+
+
+class FileLock:
+    """Advisory lock shared with KeganOS: an exclusively created `<path>.lock` file"""
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT, stale_seconds=STALE_LOCK_SECONDS):
+        self.lock_path = f"{path}{LOCK_SUFFIX}"
+        self.timeout = timeout
+        self.stale_seconds = stale_seconds
+        self.acquired = False
+        self.token = f"{os.getpid()} {uuid.uuid4().hex}".encode()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | _BINARY)
+            except FileExistsError:
+                self._break_if_stale()
+            except PermissionError:
+                pass  # Windows: the lock file is being deleted right now
+            else:
+                os.write(fd, self.token)
+                os.close(fd)
+                self.acquired = True
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_RETRY_INTERVAL)
+
+    def _read_lock(self, path):
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _is_stale(self, path):
+        try:
+            return time.time() - os.path.getmtime(path) > self.stale_seconds
+        except OSError:
+            return False
+
+    def _break_if_stale(self):
+        """Remove a crashed writer's lock, but only if the file actually taken away is stale"""
+        if not self._is_stale(self.lock_path):
+            return
+        aside = f"{self.lock_path}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self.lock_path, aside)  # Atomic, so only one waiter can get hold of the file
+        except OSError:
+            return
+        # The lock may have been replaced since the check above; rename keeps the mtime, so judge this file
+        if self._is_stale(aside):
+            try:
+                os.remove(aside)
+                print(f"Removed stale lock {self.lock_path}")
+            except OSError:
+                pass
+            return
+        # Another waiter broke it first and this is its fresh lock: hand it back
+        try:
+            if not os.path.exists(self.lock_path):
+                os.rename(aside, self.lock_path)
+            else:
+                os.remove(aside)
+        except OSError:
+            pass
+
+    def release(self):
+        if self.acquired:
+            if self._read_lock(self.lock_path) == self.token:
+                try:
+                    os.remove(self.lock_path)
+                except OSError:
+                    pass
+            self.acquired = False
+
+    def __enter__(self):
+        if not self.acquire():
+            print(f"Warning: Could not lock {self.lock_path} in {self.timeout}s, appending anyway")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def is_locked(path):
+    return os.path.exists(f"{path}{LOCK_SUFFIX}")
+
+
+def _ends_with_newline(fd):
+    size = os.fstat(fd).st_size
+    if size == 0:
+        return True
+    # Seeking only affects this read, O_APPEND writes always go to the end
+    os.lseek(fd, size - 1, os.SEEK_SET)
+    return os.read(fd, 1) == b"\n"
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def append_record(path, record, terminate=True, timeout=LOCK_TIMEOUT):
+    """Append one complete record (a str) to `path` following the protocol above.
+
+    terminate: make sure the record ends with a newline (time.csv rows). The notes journal
+    uses leading blank lines as separators instead, so it passes terminate=False.
+    """
+    if terminate and not record.endswith("\n"):
+        record += "\n"
+    with FileLock(path, timeout):
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | _BINARY, 0o644)
+        try:
+            if terminate and not _ends_with_newline(fd):
+                record = "\n" + record
+            _write_all(fd, record.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+
+# ---------------------------- STRESS TEST ------------------------------- #
+def _stress_writer(path, writer_id, records):
+    for index in range(records):
+        # The last field is a checksum of the rest so a torn row is detectable
+        body = f"{writer_id},{index},{'x' * (index % 50)}"
+        append_record(path, f"{body},{sum(body.encode()) % 9973}")
+
+
+def stress_test(path, writers=8, records=2000):
+    """Several processes append at once; returns (records/s, problems found)"""
+    import multiprocessing
+    if os.path.exists(path):
+        os.remove(path)
+    processes = [multiprocessing.Process(target=_stress_writer, args=(path, writer_id, records))
+                 for writer_id in range(writers)]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    problems = []
+    seen = set()
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.endswith(b"\n"):
+        problems.append("file does not end with a complete record")
+    for line in data.decode("utf-8").splitlines():
+        parts = line.split(",")
+        body = ",".join(parts[:-1])
+        if len(parts) != 4 or str(sum(body.encode()) % 9973) != parts[-1]:
+            problems.append(f"corrupted row: {line!r}")
+            continue
+        key = (int(parts[0]), int(parts[1]))
+        if key in seen:
+            problems.append(f"duplicate row: {line!r}")
+        seen.add(key)
+    missing = writers * records - len(seen)
+    if missing:
+        problems.append(f"{missing} records lost")
+    return writers * records / elapsed, problems
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    stress_path = os.path.join(tempfile.mkdtemp(), "stress.csv")
+    throughput, problems = stress_test(stress_path, writers, records)
+    print(f"{writers} writers x {records} records: {throughput:.0f} records/s")
+    for problem in problems[:20]:
+        print(problem)
+    print("FAILED" if problems else "OK: no records lost or corrupted")
+    sys.exit(1 if problems else 0)
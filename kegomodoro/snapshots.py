@@ -0,0 +1,325 @@
+"""Incremental, content-addressed snapshots of KEGOMODORO's data files.
+
+Files are cut into content-defined chunks (a rolling hash picks the cut points, so an
+edit in the middle of the journal only changes the chunks around it). Chunks are stored
+once under their SHA-256 in dependencies/snapshots/chunks, and each snapshot is a small
+JSON manifest listing the chunks of every file. Files whose size and mtime didn't change
+since the last snapshot aren't even read again.
+
+    python snapshots.py create
+    python snapshots.py list
+    python snapshots.py verify [SNAPSHOT]
+    python snapshots.py restore SNAPSHOT [--to DIR]
+    python snapshots.py prune --keep-last 20 --keep-daily 30
+"""
+import argparse
+import datetime as dt
+import hashlib
+import json
+import os
+import sys
+import threading
+import zlib
+
+from paths import (CONFIGURATION_PATH, DEPENDENCIES, FLOATING_WINDOW_CHECKER_PATH, PHASE_HISTORY_PATH, SAVE_FILE_NAME,
+                   TEXTS, TIME_CSV_PATH, TIMERS_CSV_PATH)
+from shared_append import FileLock
+
+SNAPSHOT_DIR = os.path.join(DEPENDENCIES, "snapshots")
+SNAPSHOT_FILES = [CONFIGURATION_PATH, TIME_CSV_PATH, FLOATING_WINDOW_CHECKER_PATH, SAVE_FILE_NAME, TIMERS_CSV_PATH,
+                  PHASE_HISTORY_PATH]
+# Files other processes append to; read and restored while holding their shared lock
+LOCKED_FILES = {TIME_CSV_PATH, SAVE_FILE_NAME, PHASE_HISTORY_PATH}
+
+MIN_CHUNK = 2 * 1024
+AVG_CHUNK_MASK = (1 << 13) - 1     # ~8 KiB average chunks
+MAX_CHUNK = 64 * 1024
+DEFAULT_KEEP_LAST = 20
+DEFAULT_KEEP_DAILY = 30
+STORE_LOCK_TIMEOUT = 30.0       # seconds to wait for another process' create/prune
+STORE_LOCK_STALE_SECONDS = 600.0
+
+# Gear table for the rolling hash (fixed, so the same content always cuts the same way)
+_GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "little") for i in range(256)]
+
+
+def chunk_boundaries(data):
+    """Yield (start, end) of content-defined chunks of `data`"""
+    start = 0
+    length = len(data)
+    while start < length:
+        end = min(start + MAX_CHUNK, length)
+        if end - start > MIN_CHUNK:
+            rolling = 0
+            for index in range(start + MIN_CHUNK, end):
+                rolling = ((rolling << 1) + _GEAR[data[index]]) & 0xFFFFFFFF
+                if rolling & AVG_CHUNK_MASK == 0:
+                    end = index + 1
+                    break
+        yield start, end
+        start = end
+
+
+class SnapshotStore:
+    def __init__(self, root=SNAPSHOT_DIR, base_dir=TEXTS):
+        self.root = root
+        self.base_dir = base_dir
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.manifests_dir = os.path.join(root, "manifests")
+
+    # ------------------------------ CHUNKS ------------------------------ #
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def _put_chunk(self, data):
+        """Store a chunk unless we already have it; returns (digest, bytes written)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        packed = zlib.compress(data)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(packed)
+        os.replace(temp_path, path)
+        return digest, len(packed)
+
+    def _get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as file:
+            data = zlib.decompress(file.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"chunk {digest} is corrupted")
+        return data
+
+    # ------------------------------ MANIFESTS ------------------------------ #
+    def list(self):
+        """Snapshot ids, oldest first"""
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.manifests_dir) if name.endswith(".json"))
+
+    def manifest(self, snapshot_id):
+        with open(os.path.join(self.manifests_dir, f"{snapshot_id}.json"), "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        path = os.path.join(self.manifests_dir, f"{manifest['id']}.json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=1, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def _new_id(self):
+        snapshot_id = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+        existing = set(self.list())
+        suffix = 1
+        candidate = snapshot_id
+        while candidate in existing:
+            suffix += 1
+            candidate = f"{snapshot_id}-{suffix:03d}"  # Zero-padded so ids keep sorting by age
+        return candidate
+
+    def _locked(self):
+        """Store-wide lock: only one create/prune at a time, across threads and processes"""
+        os.makedirs(self.root, exist_ok=True)
+        lock = FileLock(self.root, STORE_LOCK_TIMEOUT, STORE_LOCK_STALE_SECONDS)
+        if not lock.acquire():
+            raise OSError(f"{self.root} is busy with another snapshot")
+        return lock
+
+    # ------------------------------ SNAPSHOT ------------------------------ #
+    def create(self, files=SNAPSHOT_FILES):
+        """Snapshot `files`; returns (snapshot id, bytes written). Nothing is written if nothing changed."""
+        lock = self._locked()
+        try:
+            return self._create(files)
+        finally:
+            lock.release()
+
+    def _create(self, files):
+        snapshots = self.list()
+        previous = self.manifest(snapshots[-1])["files"] if snapshots else {}
+        entries = {}
+        written = 0
+        for path in files:
+            if not os.path.exists(path):
+                continue
+            name = os.path.relpath(path, self.base_dir)
+            stat = os.stat(path)
+            old = previous.get(name)
+            if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                entries[name] = old  # Unchanged, reuse its chunk list
+                continue
+            if path in LOCKED_FILES:
+                with FileLock(path):
+                    data = self._read(path)
+            else:
+                data = self._read(path)
+            chunks = []
+            for start, end in chunk_boundaries(data):
+                digest, size = self._put_chunk(data[start:end])
+                chunks.append(digest)
+                written += size
+            entries[name] = {"size": len(data), "mtime_ns": stat.st_mtime_ns,
+                             "sha256": hashlib.sha256(data).hexdigest(), "chunks": chunks}
+
+        if snapshots and entries == previous:
+            return snapshots[-1], 0
+        manifest = {"id": self._new_id(), "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+                    "files": entries}
+        self._write_manifest(manifest)
+        return manifest["id"], written
+
+    @staticmethod
+    def _read(path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def restore(self, snapshot_id, target_dir=None, names=None):
+        """Write the snapshot's files back (into target_dir, default the live data folder)"""
+        target_dir = target_dir or self.base_dir
+        restored = []
+        for name, entry in self.manifest(snapshot_id)["files"].items():
+            if names and name not in names:
+                continue
+            data = b"".join(self._get_chunk(digest) for digest in entry["chunks"])
+            if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                raise ValueError(f"{name} in snapshot {snapshot_id} does not match its checksum")
+            path = os.path.join(target_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.restore"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            with FileLock(path):
+                os.replace(temp_path, path)
+            restored.append(path)
+        return restored
+
+    def verify(self, snapshot_id=None):
+        """Check chunks and file checksums of one snapshot (default all); returns a list of problems"""
+        problems = []
+        checked = {}
+        for current in [snapshot_id] if snapshot_id else self.list():
+            try:
+                files = self.manifest(current)["files"]
+            except (OSError, ValueError) as e:
+                problems.append(f"{current}: unreadable manifest ({e})")
+                continue
+            for name, entry in files.items():
+                digest = hashlib.sha256()
+                for chunk in entry["chunks"]:
+                    if chunk not in checked:
+                        try:
+                            checked[chunk] = self._get_chunk(chunk)
+                        except (OSError, ValueError, zlib.error) as e:
+                            checked[chunk] = None
+                            problems.append(f"{current}: {name}: chunk {chunk[:12]} {e}")
+                    if checked[chunk] is not None:
+                        digest.update(checked[chunk])
+                if digest.hexdigest() != entry["sha256"]:
+                    problems.append(f"{current}: {name} does not match its checksum")
+        return problems
+
+    def prune(self, keep_last=DEFAULT_KEEP_LAST, keep_daily=DEFAULT_KEEP_DAILY):
+        """Keep the newest `keep_last` snapshots plus the newest one of each of the last `keep_daily` days,
+        delete the rest and any chunk no remaining snapshot uses. Returns the deleted ids."""
+        lock = self._locked()
+        try:
+            return self._prune(keep_last, keep_daily)
+        finally:
+            lock.release()
+
+    def _prune(self, keep_last, keep_daily):
+        snapshots = self.list()
+        keep = set(snapshots[-keep_last:]) if keep_last else set()
+        days = {}
+        for snapshot_id in snapshots:
+            days[snapshot_id[:8]] = snapshot_id  # Sorted, so the newest of the day wins
+        for day in sorted(days)[-keep_daily:] if keep_daily else []:
+            keep.add(days[day])
+        deleted = [snapshot_id for snapshot_id in snapshots if snapshot_id not in keep]
+        for snapshot_id in deleted:
+            os.remove(os.path.join(self.manifests_dir, f"{snapshot_id}.json"))
+        if deleted:
+            self._collect_garbage()
+        return deleted
+
+    def _collect_garbage(self):
+        if not os.path.isdir(self.chunks_dir):
+            return  # Only empty files were ever snapshotted
+        used = set()
+        for snapshot_id in self.list():
+            for entry in self.manifest(snapshot_id)["files"].values():
+                used.update(entry["chunks"])
+        for folder in os.listdir(self.chunks_dir):
+            folder_path = os.path.join(self.chunks_dir, folder)
+            for name in os.listdir(folder_path):
+                if name not in used:
+                    os.remove(os.path.join(folder_path, name))
+
+
+# ---------------------------- BACKGROUND JOB ------------------------------- #
+def start_snapshot_job(interval_minutes, store=None, keep_last=DEFAULT_KEEP_LAST, keep_daily=DEFAULT_KEEP_DAILY):
+    """Snapshot (and prune) every `interval_minutes` on a daemon thread; returns its stop Event"""
+    store = store or SnapshotStore()
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval_minutes * 60):
+            try:
+                snapshot_id, written = store.create()
+                store.prune(keep_last, keep_daily)
+                print(f"Snapshot {snapshot_id}: {written} bytes written")
+            except Exception as e:
+                print(f"Snapshot failed: {e}")
+
+    threading.Thread(target=run, name="SnapshotJob", daemon=True).start()
+    return stop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental snapshots of KEGOMODORO's data files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("create")
+    commands.add_parser("list")
+    verify_parser = commands.add_parser("verify")
+    verify_parser.add_argument("snapshot", nargs="?")
+    restore_parser = commands.add_parser("restore")
+    restore_parser.add_argument("snapshot")
+    restore_parser.add_argument("--to", help="Restore into this folder instead of the live data folder")
+    prune_parser = commands.add_parser("prune")
+    prune_parser.add_argument("--keep-last", type=int, default=DEFAULT_KEEP_LAST)
+    prune_parser.add_argument("--keep-daily", type=int, default=DEFAULT_KEEP_DAILY)
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore()
+    try:
+        if args.command == "create":
+            snapshot_id, written = store.create()
+            print(f"Snapshot {snapshot_id}: {written} bytes written")
+        elif args.command == "list":
+            for snapshot_id in store.list():
+                files = store.manifest(snapshot_id)["files"]
+                print(f"{snapshot_id}  {len(files)} files  {sum(entry['size'] for entry in files.values())} bytes")
+        elif args.command == "verify":
+            problems = store.verify(args.snapshot)
+            for problem in problems:
+                print(problem)
+            print("FAILED" if problems else "OK")
+            return 1 if problems else 0
+        elif args.command == "restore":
+            for path in store.restore(args.snapshot, args.to):
+                print(f"Restored {path}")
+        elif args.command == "prune":
+            deleted = store.prune(args.keep_last, args.keep_daily)
+            print(f"Deleted {len(deleted)} snapshots")
+    except (OSError, ValueError) as e:
+        print(f"Snapshot command failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""KEGOMODORO's modules import each other by bare name (they run from their own folder)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
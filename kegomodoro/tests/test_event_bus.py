@@ -0,0 +1,52 @@
+import threading
+import time
+
+from event_bus import DROP_OLDEST, KEEP_ALL, DataWritten, EventBus, SessionSaved
+
+
+def session(second=0):
+    return SessionSaved(0, 0, second, False, "", "\n", "12/21/2025")
+
+
+def test_keep_all_never_drops_or_waits():
+    bus = EventBus()
+    handled = []
+    bus.subscribe("persistence", lambda event: (time.sleep(0.001), handled.append(event)), SessionSaved,
+                  maxsize=4, policy=KEEP_ALL)
+    started = time.perf_counter()
+    for second in range(200):
+        bus.publish(session(second))
+    assert time.perf_counter() - started < 0.5
+    bus.close()
+    assert [event.second for event in handled] == list(range(200))
+    assert bus.metrics()["persistence"]["dropped"] == 0
+
+
+def test_close_stops_a_full_drop_oldest_worker():
+    bus = EventBus()
+    release = threading.Event()
+    slow = bus.subscribe("heatmap", lambda event: release.wait(0.2), DataWritten, maxsize=1, policy=DROP_OLDEST)
+    # A persistence worker publishing while the bus closes (it used to evict the stop sentinel)
+    def persist(event):
+        time.sleep(0.3)     # Still writing when close() queues the stop sentinels
+        bus.publish(DataWritten("journal"))
+
+    bus.subscribe("persistence", persist, SessionSaved, maxsize=4, policy=KEEP_ALL)
+    bus.publish(DataWritten("a"))
+    time.sleep(0.01)
+    bus.publish(DataWritten("b"))
+    bus.publish(session())
+
+    started = time.monotonic()
+    bus.close(timeout=2.0)
+    assert time.monotonic() - started < 1.5
+    assert not slow.thread.is_alive()
+
+
+def test_publish_after_close_is_ignored():
+    bus = EventBus()
+    handled = []
+    bus.subscribe("notepad", handled.append, DataWritten)
+    bus.close()
+    bus.publish(DataWritten("journal"))
+    assert handled == []
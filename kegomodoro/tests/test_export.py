@@ -0,0 +1,81 @@
+import csv
+import json
+
+import pytest
+
+from export import export
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = {
+        "sessions_path": tmp_path / "time.csv",
+        "notes_path": tmp_path / "journal.txt",
+        "phases_path": tmp_path / "phase_history.bin",
+        "watermark_path": tmp_path / "export_watermark.json",
+    }
+    paths["sessions_path"].write_text("hours,minute,second\n0,25,0\n1,0,0\n0,5,30", encoding="utf-8")
+    paths["notes_path"].write_text("\n\n12/20/2025\n01:00:00 first\n\n12/21/2025\n00:30:00 second",
+                                   encoding="utf-8")
+    return {key: str(path) for key, path in paths.items()}
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_full_export_keeps_unterminated_tail_row(tmp_path, files):
+    output = tmp_path / "sessions.csv"
+    assert export(str(output), kind="sessions", **files) == 3
+    with open(output, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["hours"], row["minute"], row["second"]) for row in rows] == [("0", "25", "0"), ("1", "0", "0"),
+                                                                            ("0", "5", "30")]
+
+
+def test_incremental_export_holds_back_tail_until_terminated(tmp_path, files):
+    first = tmp_path / "first.jsonl"
+    assert export(str(first), kind="sessions", incremental=True, **files) == 2
+
+    with open(files["sessions_path"], "a", encoding="utf-8") as file:
+        file.write("\n2,0,0\n")
+    second = tmp_path / "second.jsonl"
+    assert export(str(second), kind="sessions", incremental=True, **files) == 2
+    assert [record["duration_seconds"] for record in read_jsonl(second)] == [330, 7200]
+
+    third = tmp_path / "third.jsonl"
+    assert export(str(third), kind="sessions", incremental=True, **files) == 0
+
+
+def test_incremental_notes_reexport_merged_last_entry(tmp_path, files):
+    first = tmp_path / "first.jsonl"
+    assert export(str(first), kind="notes", incremental=True, **files) == 2
+
+    # KeganOS merges more time into the last entry in place
+    with open(files["notes_path"], "w", encoding="utf-8") as file:
+        file.write("\n\n12/20/2025\n01:00:00 first\n\n12/21/2025\n01:15:00 second\n\nmerged")
+    second = tmp_path / "second.jsonl"
+    assert export(str(second), kind="notes", incremental=True, **files) == 1
+    assert read_jsonl(second)[0]["duration_seconds"] == 4500
+
+    third = tmp_path / "third.jsonl"
+    assert export(str(third), kind="notes", incremental=True, **files) == 0
+
+
+def test_incremental_notes_rewritten_prefix_exports_everything(tmp_path, files):
+    assert export(str(tmp_path / "first.jsonl"), kind="notes", incremental=True, **files) == 2
+    with open(files["notes_path"], "w", encoding="utf-8") as file:
+        file.write("\n\n12/19/2025\n02:00:00 edited\n\n12/21/2025\n00:30:00 second")
+    assert export(str(tmp_path / "second.jsonl"), kind="notes", incremental=True, **files) == 2
+
+
+def test_incremental_with_date_filter_is_rejected(tmp_path, files):
+    with pytest.raises(ValueError):
+        export(str(tmp_path / "out.csv"), incremental=True, since="2025-12-01", **files)
+
+
+def test_date_filter_selects_notes(tmp_path, files):
+    output = tmp_path / "notes.jsonl"
+    assert export(str(output), kind="notes", since="2025-12-21", **files) == 1
+    assert read_jsonl(output)[0]["date"] == "2025-12-21"
@@ -0,0 +1,61 @@
+import time
+
+from idle_monitor import IdleMonitor, StubActivitySource, subtract_idle
+
+
+def test_sample_reports_idle_past_threshold():
+    source = StubActivitySource()
+    monitor = IdleMonitor(source, threshold=300)
+
+    monitor.sample()
+    assert not monitor.is_idle
+
+    source.set_idle(301)
+    monitor.sample()
+    assert monitor.is_idle
+    assert monitor.idle_seconds >= 301
+
+    source.poke()
+    monitor.sample()
+    assert not monitor.is_idle
+
+
+def test_zero_threshold_never_idle():
+    monitor = IdleMonitor(StubActivitySource(idle=3600), threshold=0)
+    monitor.sample()
+    assert not monitor.is_idle
+
+
+def test_sampler_thread_follows_source():
+    source = StubActivitySource()
+    monitor = IdleMonitor(source, threshold=60, interval=0.01)
+    monitor.start()
+    try:
+        source.set_idle(120)
+        deadline = time.monotonic() + 2
+        while not monitor.is_idle and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert monitor.is_idle
+        source.poke()
+        deadline = time.monotonic() + 2
+        while monitor.is_idle and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not monitor.is_idle
+    finally:
+        monitor.stop()
+        monitor.join(1)
+    assert not monitor.is_alive()
+
+
+def test_auto_pause_subtracts_the_idle_span():
+    # What the stopwatch does when it finds the monitor idle: take the idle time back off
+    source = StubActivitySource(idle=5 * 60 + 30)
+    monitor = IdleMonitor(source, threshold=5 * 60)
+    monitor.sample()
+    assert monitor.is_idle
+    assert subtract_idle(1, 10, 0, monitor.idle_seconds) == (1, 4, 30)
+
+
+def test_subtract_idle_never_goes_negative():
+    assert subtract_idle(0, 2, 0, 600) == (0, 0, 0)
+    assert subtract_idle(2, 0, 5, 10) == (1, 59, 55)
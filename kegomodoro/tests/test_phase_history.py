@@ -0,0 +1,74 @@
+import datetime as dt
+
+from phase_history import COMPLETED, INTERRUPTED, SKIPPED, PhaseClock, PhaseHistory, iter_phases
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_766_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_phase_abandoned_before_its_countdown_is_skipped():
+    clock = FakeClock()
+    phases = PhaseClock(clock)
+    phases.offer("short_break", 300, 2)
+    offered_at = clock.now
+    clock.now += 120    # Waiting for Resume, then reset
+
+    assert phases.end(INTERRUPTED) == ("short_break", 2, SKIPPED, offered_at, 300, 0)
+    assert phases.end(INTERRUPTED) is None
+
+
+def test_phase_starts_on_its_first_tick():
+    clock = FakeClock()
+    phases = PhaseClock(clock)
+    phases.offer("work", 1500, 3)
+    clock.now += 90     # Paused until Resume
+    started_at = clock.now
+    phases.tick(1500)
+    clock.now += 1
+    phases.tick(1499)   # Later ticks don't move the start
+    phases.tick(0)
+
+    assert phases.end(COMPLETED) == ("work", 3, COMPLETED, started_at, 1500, 1500)
+
+
+def test_interrupted_phase_counts_what_ran():
+    phases = PhaseClock(FakeClock())
+    phases.offer("work", 1500, 1)
+    phases.tick(1500)
+    phases.tick(900)
+    assert phases.end(INTERRUPTED)[2:] == (INTERRUPTED, phases.clock.now, 1500, 600)
+
+
+def test_nothing_recorded_without_an_offer():
+    phases = PhaseClock(FakeClock())
+    phases.tick(10)
+    assert phases.end(COMPLETED) is None
+
+
+def test_log_round_trip(tmp_path):
+    history = PhaseHistory(str(tmp_path / "phase_history.bin"))
+    started = dt.datetime(2025, 12, 21, 9, 0).timestamp()
+    history.extend([
+        (started, 1500, 1500, "work", COMPLETED, 1),
+        (started + 1500, 300, 0, "short_break", SKIPPED, 2),
+        (started + 1800, 1500, 600, "work", INTERRUPTED, 3),
+    ])
+    history.append(started + 86400, 1500, 1200, "work", COMPLETED, 1)
+
+    assert history.count() == 4
+    records = [record for record, _ in history.iter_records()]
+    assert records[1] == {"started_at": started + 1500, "planned_seconds": 300, "actual_seconds": 0,
+                          "phase": "short_break", "outcome": SKIPPED, "cycle": 2}
+    assert history.daily_totals() == {"2025-12-21": 2100, "2025-12-22": 1200}
+    assert [record["duration_seconds"] for record, _ in iter_phases(history.path)] == [1500, 0, 600, 1200]
+
+
+def test_load_slices_by_index(tmp_path):
+    history = PhaseHistory(str(tmp_path / "phase_history.bin"))
+    history.extend((1_766_000_000.0 + index, 60, index, "work", COMPLETED, 1) for index in range(10))
+    assert list(history.load(3, 6).actual) == [3, 4, 5]
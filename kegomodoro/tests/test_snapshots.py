@@ -0,0 +1,114 @@
+import os
+import threading
+
+import pytest
+
+from snapshots import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    base = tmp_path / "texts"
+    base.mkdir()
+    return SnapshotStore(str(tmp_path / "snapshots"), str(base))
+
+
+def write(store, name, data):
+    path = os.path.join(store.base_dir, name)
+    with open(path, "wb") as file:
+        file.write(data)
+    return path
+
+
+def chunk_count(store):
+    return sum(len(files) for _, _, files in os.walk(store.chunks_dir))
+
+
+def test_unchanged_files_write_nothing(store):
+    path = write(store, "journal.txt", os.urandom(200_000))
+    first, written = store.create([path])
+    assert written > 0
+    assert store.create([path]) == (first, 0)
+    assert store.list() == [first]
+
+
+def test_edit_only_stores_the_changed_chunks(store):
+    data = bytearray(os.urandom(400_000))
+    path = write(store, "journal.txt", bytes(data))
+    store.create([path])
+    before = chunk_count(store)
+
+    data[200_000:200_010] = b"0123456789"
+    write(store, "journal.txt", bytes(data))
+    os.utime(path, ns=(1, 1))  # Make sure the mtime differs
+    store.create([path])
+    assert 0 < chunk_count(store) - before <= 3
+    assert store.verify() == []
+
+
+def test_restore_round_trip(store, tmp_path):
+    original = os.urandom(50_000)
+    path = write(store, "time.csv", original)
+    snapshot_id, _ = store.create([path])
+    write(store, "time.csv", b"overwritten")
+
+    target = tmp_path / "restored"
+    store.restore(snapshot_id, str(target))
+    assert (target / "time.csv").read_bytes() == original
+
+
+def test_same_second_ids_sort_by_age(store):
+    path = write(store, "notes.txt", b"0")
+    ids = []
+    for index in range(12):
+        write(store, "notes.txt", str(index).encode() * (index + 1))
+        ids.append(store.create([path])[0])
+    assert store.list() == sorted(ids)
+    assert ids == sorted(ids)
+
+
+def test_prune_keeps_newest_and_drops_unused_chunks(store):
+    path = write(store, "notes.txt", b"")
+    for index in range(5):
+        write(store, "notes.txt", os.urandom(10_000))
+        store.create([path])
+    snapshots = store.list()
+    deleted = store.prune(keep_last=2, keep_daily=0)
+    assert deleted == snapshots[:3]
+    assert store.list() == snapshots[3:]
+    assert chunk_count(store) == sum(len(entry["chunks"]) for snapshot_id in store.list()
+                                     for entry in store.manifest(snapshot_id)["files"].values())
+    assert store.verify() == []
+
+
+def test_prune_without_chunks_dir(store):
+    path = write(store, "empty.txt", b"")
+    store.create([path])
+    write(store, "empty.txt", b"")
+    os.utime(path, ns=(1, 1))
+    store.create([path])
+    assert not os.path.exists(store.chunks_dir)
+    assert len(store.prune(keep_last=1, keep_daily=0)) == 1
+
+
+def test_concurrent_create_and_prune(store):
+    path = write(store, "notes.txt", b"")
+    errors = []
+
+    def work(writer):
+        try:
+            for index in range(10):
+                write(store, "notes.txt", f"{writer}-{index}".encode() * 1000)
+                store.create([path])
+                store.prune(keep_last=3, keep_daily=0)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(writer,)) for writer in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(store.list()) == 3
+    assert store.verify() == []
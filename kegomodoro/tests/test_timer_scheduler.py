@@ -0,0 +1,116 @@
+import itertools
+
+from timer_scheduler import POMODORO, SHORT_BREAK, STOPWATCH, WORK, TimerScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRoot:
+    """Just enough of Tk's after/after_cancel to drive the scheduler by hand"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pending = {}
+        self._ids = itertools.count()
+
+    def after(self, delay_ms, callback):
+        after_id = f"after#{next(self._ids)}"
+        self.pending[after_id] = (self.clock.now + delay_ms / 1000, callback)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def advance(self, seconds):
+        """Move the clock forward, firing due callbacks in order"""
+        end = self.clock.now + seconds
+        while True:
+            due = [(when, after_id) for after_id, (when, _) in self.pending.items() if when <= end]
+            if not due:
+                break
+            when, after_id = min(due)
+            self.clock.now = max(self.clock.now, when)
+            _, callback = self.pending.pop(after_id)
+            callback()
+        self.clock.now = end
+
+
+def make_scheduler():
+    clock = FakeClock()
+    root = FakeRoot(clock)
+    return TimerScheduler(root, clock=clock), root
+
+
+def wakeups_per_minute(timer_count):
+    scheduler, root = make_scheduler()
+    scheduler.on_display(lambda _: None)
+    for index in range(timer_count):
+        kind = POMODORO if index % 2 else STOPWATCH
+        scheduler.add(f"timer {index}", kind, work_min=25 + index)
+        scheduler.start(f"timer {index}")
+    root.advance(60)
+    return scheduler.wakeups, len(root.pending)
+
+
+def test_wakeups_stay_flat_as_timers_are_added():
+    one_wakeups, one_pending = wakeups_per_minute(1)
+    many_wakeups, many_pending = wakeups_per_minute(200)
+    # One display refresh a second, however many timers run
+    assert 55 <= one_wakeups <= 61
+    assert abs(many_wakeups - one_wakeups) <= 1
+    assert one_pending == many_pending == 1
+
+
+def test_no_wakeups_without_running_timers():
+    scheduler, root = make_scheduler()
+    scheduler.on_display(lambda _: None)
+    scheduler.add("paused", POMODORO)
+    root.advance(3600)
+    assert scheduler.wakeups == 0
+    assert not root.pending
+
+
+def test_pomodoro_advances_exactly_at_its_deadline():
+    scheduler, root = make_scheduler()
+    phases = []
+    scheduler.on_phase(lambda timer: phases.append((timer.phase, timer.running_since)))
+    timer = scheduler.add("focus", POMODORO, work_min=1, short_break_min=1)
+    started = root.clock.now
+    scheduler.start("focus")
+    assert timer.phase == WORK
+
+    root.advance(61)
+    assert phases == [(SHORT_BREAK, started + 60)]
+    assert timer.display(root.clock.now) == "00:59"
+
+
+def test_paused_timer_keeps_its_time():
+    scheduler, root = make_scheduler()
+    timer = scheduler.add("watch", STOPWATCH)
+    scheduler.start("watch")
+    root.advance(90)
+    scheduler.pause("watch")
+    root.advance(600)
+    assert timer.display(root.clock.now) == "01:30"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "timers.csv"
+    clock = FakeClock()
+    scheduler = TimerScheduler(FakeRoot(clock), path=str(path), clock=clock)
+    scheduler.add("focus", POMODORO, work_min=50)
+    scheduler.start("focus")
+    clock.now += 125
+    scheduler.focus("focus")
+
+    loaded = TimerScheduler(FakeRoot(clock), path=str(path), clock=clock)
+    loaded.load()
+    timer = loaded.timers["focus"]
+    assert (timer.kind, timer.work_min, timer.elapsed, timer.running) == (POMODORO, 50, 125.0, False)
+    assert loaded.focused == "focus"
@@ -0,0 +1,267 @@
+"""Runtime theming for KEGOMODORO.
+
+Tk widgets copy their colors when they are created, so changing BLACK/WHITE/ORANGE
+after start-up does nothing on its own. The ThemeEngine keeps a registry of themed
+widgets and re-skins all of them in a single pass when the theme changes (for
+example when KeganOS' ThemeService rewrites configuration.csv).
+"""
+import csv
+import hashlib
+import os
+import re
+import tkinter as tk
+from collections import OrderedDict
+
+# Roles a themed option can be bound to
+TEXT = "text"
+BG = "bg"
+ACCENT = "accent"
+ROLES = (TEXT, BG, ACCENT)
+
+# Max tinted images kept in memory (a few themes x a couple of assets)
+TINT_CACHE_SIZE = 16
+HEX_COLOR = re.compile(r"^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+
+class Theme:
+    """The three colors KeganOS writes into configuration.csv"""
+
+    def __init__(self, text, bg, accent, tint=False):
+        self.text = text
+        self.bg = bg
+        self.accent = accent
+        self.tint = tint
+
+    def color(self, role):
+        return getattr(self, role)
+
+    @property
+    def key(self):
+        """Short hash identifying the theme, used as the tint cache key"""
+        raw = f"{self.text}|{self.bg}|{self.accent}".lower()
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+    def __eq__(self, other):
+        return isinstance(other, Theme) and self.key == other.key and self.tint == other.tint
+
+    def __repr__(self):
+        return f"Theme(text={self.text}, bg={self.bg}, accent={self.accent}, tint={self.tint})"
+
+
+def read_theme(config_path):
+    """Read the THEME_* columns from configuration.csv.
+
+    None unless all three are #rgb/#rrggbb colors, which also covers a row KeganOS is
+    still in the middle of writing.
+    """
+    try:
+        with open(config_path, "r", newline='', encoding="utf-8-sig") as file:
+            config = next(csv.DictReader(file))
+    except (OSError, StopIteration, csv.Error):
+        return None
+    colors = [str(config.get(column) or "").strip() for column in ("THEME_TEXT", "THEME_BG", "THEME_ACCENT")]
+    if not all(HEX_COLOR.match(color) for color in colors):
+        return None
+    tint = str(config.get("THEME_TINT", "")).lower() in ["true", "1", "yes"]
+    return Theme(*colors, tint)
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip("#")
+    if len(color) == 3:
+        color = "".join(c * 2 for c in color)
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class ThemeEngine:
+    """Tracks themed widgets/assets and re-skins them in one batched pass"""
+
+    def __init__(self, root, theme):
+        self.root = root
+        self.theme = theme
+        self._widgets = []       # (widget, {option: role})
+        self._tracked = []       # (widget, (option, ...)) remapped by current value
+        self._images = []        # (target, item or None, path, option)
+        self._listeners = []
+        self._sources = {}       # path -> (mtime, decoded PIL image)
+        self._tinted = OrderedDict()  # (path, mtime, theme key) -> PhotoImage
+        self._watch_mtime = None
+        self.swaps = 0
+
+    # ------------------------------ REGISTRATION ------------------------------ #
+    def register(self, widget, **roles):
+        """Bind widget options to roles, e.g. register(button, background=TEXT, foreground=BG)"""
+        for role in roles.values():
+            if role not in ROLES:
+                raise ValueError(f"Unknown theme role: {role}")
+        self._widgets.append((widget, roles))
+        return widget
+
+    def register_item(self, canvas, item, **roles):
+        """Same as register() for a canvas item, e.g. register_item(canvas, ring, outline=ACCENT)"""
+        return self.register(_CanvasItem(canvas, item), **roles)
+
+    def track(self, widget, *options):
+        """Remap options whose current value is one of the theme colors.
+
+        Used for widgets that flip colors at runtime (timer_label goes ORANGE -> BLACK -> DEEP_GOLD),
+        so only the value that came from the old theme is replaced.
+        """
+        self._tracked.append((widget, options))
+        return widget
+
+    def register_image(self, target, path, item=None, option="image"):
+        """Keep a widget (or canvas item) showing `path`, tinted for the active theme when enabled"""
+        entry = (target, item, path, option)
+        self._images.append(entry)
+        self._set_image(entry)
+        return entry
+
+    def on_change(self, callback):
+        """callback(old_theme, new_theme) runs after every swap (main.py updates its constants here)"""
+        self._listeners.append(callback)
+
+    # ------------------------------ APPLYING ------------------------------ #
+    def apply(self, theme, force=False):
+        """Swap to `theme`. Returns False if nothing changed."""
+        if theme is None or (theme == self.theme and not force):
+            return False
+        old = self.theme
+        self.theme = theme
+
+        # Collect every option per widget first so each widget is configured exactly once
+        pending = {}
+        for widget, roles in self._widgets:
+            options = pending.setdefault(widget, {})
+            for option, role in roles.items():
+                options[option] = theme.color(role)
+        for widget, options in self._tracked:
+            updates = pending.setdefault(widget, {})
+            for option in options:
+                if option in updates:
+                    continue
+                try:
+                    current = str(widget.cget(option)).lower()
+                except tk.TclError:
+                    continue
+                for role in ROLES:
+                    if old is not None and current == old.color(role).lower():
+                        updates[option] = theme.color(role)
+                        break
+
+        dead = set()
+        for widget, options in pending.items():
+            if not options:
+                continue
+            try:
+                widget.configure(**options)
+            except tk.TclError:
+                dead.add(widget)  # Destroyed widget, forget it
+        if dead:
+            self._widgets = [(w, r) for w, r in self._widgets if w not in dead]
+            self._tracked = [(w, o) for w, o in self._tracked if w not in dead]
+
+        for entry in self._images:
+            self._set_image(entry)
+
+        for callback in self._listeners:
+            callback(old, theme)
+        self.swaps += 1
+        self.root.update_idletasks()
+        return True
+
+    def watch(self, config_path, interval_ms=1000):
+        """Poll configuration.csv (and the image files) and hot-swap when KeganOS changes them"""
+        try:
+            try:
+                mtime = os.path.getmtime(config_path)
+            except OSError:
+                mtime = None
+            if self._watch_mtime is not None and mtime != self._watch_mtime:
+                self.apply(read_theme(config_path))
+            self._watch_mtime = mtime
+
+            # ThemeService copies a new main_image.png/behelit.png over the old one
+            if any(self._source_changed(path) for path in {entry[2] for entry in self._images}):
+                for entry in self._images:
+                    self._set_image(entry)
+        except Exception as e:
+            print(f"Error: Theme watch failed: {e}")
+        finally:
+            # Keep polling whatever happened, one bad read must not end hot-swapping
+            self.root.after(interval_ms, self.watch, config_path, interval_ms)
+
+    # ------------------------------ IMAGES ------------------------------ #
+    def _source_changed(self, path):
+        cached = self._sources.get(path)
+        try:
+            return cached is not None and cached[0] != os.path.getmtime(path)
+        except OSError:
+            return False
+
+    def _source(self, path):
+        """Decoded source image, decoded again only if the file changed on disk"""
+        from PIL import Image
+        mtime = os.path.getmtime(path)
+        cached = self._sources.get(path)
+        if cached is None or cached[0] != mtime:
+            image = Image.open(path)
+            image.load()
+            cached = (mtime, image)
+            self._sources[path] = cached
+        return cached
+
+    def tinted(self, path, theme=None):
+        """PhotoImage of `path` for `theme`, cached by theme hash so switching back costs no decode"""
+        from PIL import ImageTk
+        theme = theme or self.theme
+        mtime, source = self._source(path)
+        tint = theme is not None and theme.tint
+        key = (path, mtime, theme.key if tint else None)
+        photo = self._tinted.get(key)
+        if photo is not None:
+            self._tinted.move_to_end(key)
+            return photo
+        image = tint_image(source, theme.text, theme.accent) if tint else source
+        photo = ImageTk.PhotoImage(image, master=self.root)
+        self._tinted[key] = photo
+        while len(self._tinted) > TINT_CACHE_SIZE:
+            self._tinted.popitem(last=False)
+        return photo
+
+    def _set_image(self, entry):
+        target, item, path, option = entry
+        try:
+            photo = self.tinted(path)
+            if item is None:
+                target.configure(**{option: photo})
+                target.image = photo  # Keep a reference so Tk doesn't drop it
+            else:
+                target.itemconfig(item, **{option: photo})
+        except (OSError, ValueError, tk.TclError) as e:
+            print(f"Error: Could not theme image {path}: {e}")
+
+
+class _CanvasItem:
+    """Lets a canvas item be configured like a widget"""
+
+    def __init__(self, canvas, item):
+        self.canvas = canvas
+        self.item = item
+
+    def configure(self, **options):
+        self.canvas.itemconfig(self.item, **options)
+
+    def cget(self, option):
+        return self.canvas.itemcget(self.item, option)
+
+
+def tint_image(image, dark, light, strength=0.55):
+    """Recolor an image towards the theme (dark tones -> `dark`, light tones -> `light`), keeping alpha"""
+    from PIL import Image, ImageOps
+    rgba = image.convert("RGBA")
+    alpha = rgba.getchannel("A")
+    colorized = ImageOps.colorize(rgba.convert("L"), black=_hex_to_rgb(dark), white=_hex_to_rgb(light))
+    blended = Image.blend(rgba.convert("RGB"), colorized, strength)
+    blended.putalpha(alpha)
+    return blended
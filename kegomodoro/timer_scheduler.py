@@ -0,0 +1,304 @@
+"""Named timers for KEGOMODORO, all driven by one deadline heap.
+
+Each NamedTimer (pomodoro or stopwatch) only stores when it started running and how
+much time it had before that, so it doesn't need a callback every second. The
+TimerScheduler keeps a min-heap of upcoming deadlines (pomodoro phase ends plus one
+display refresh for whoever is watching) and arms a single Tk `after` for the
+earliest one. Adding more timers adds heap entries, not wakeups.
+"""
+import csv
+import heapq
+import itertools
+import os
+import time
+
+POMODORO = "pomodoro"
+STOPWATCH = "stopwatch"
+KINDS = (POMODORO, STOPWATCH)
+
+WORK = "work"
+SHORT_BREAK = "short_break"
+LONG_BREAK = "long_break"
+
+DISPLAY_INTERVAL = 1.0
+TIMER_FIELDS = ["name", "kind", "reps", "elapsed", "work_min", "short_break_min", "long_break_min", "focused"]
+
+
+def phase_for_reps(reps):
+    """Same cycle as start_timer(): odd reps work, every 8th a long break, otherwise a short one"""
+    if reps % 8 == 0:
+        return LONG_BREAK
+    if reps % 2 == 1:
+        return WORK
+    return SHORT_BREAK
+
+
+def format_seconds(seconds):
+    seconds = max(int(round(seconds)), 0)
+    hours, rest = divmod(seconds, 3600)
+    minute, second = divmod(rest, 60)
+    if hours:
+        return f"{hours:02d}:{minute:02d}:{second:02d}"
+    return f"{minute:02d}:{second:02d}"
+
+
+class NamedTimer:
+    """A pomodoro or stopwatch that knows its time from a start anchor, not from ticks"""
+
+    def __init__(self, name, kind=STOPWATCH, work_min=25, short_break_min=5, long_break_min=20):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown timer kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.work_min = work_min
+        self.short_break_min = short_break_min
+        self.long_break_min = long_break_min
+        self.reps = 1
+        self.elapsed = 0.0          # seconds accumulated before the current run
+        self.running_since = None   # monotonic anchor while running
+        self.generation = 0         # bumped on every change, stale heap entries are skipped
+
+    @property
+    def running(self):
+        return self.running_since is not None
+
+    @property
+    def phase(self):
+        return phase_for_reps(self.reps) if self.kind == POMODORO else WORK
+
+    def phase_length(self):
+        minutes = {WORK: self.work_min, SHORT_BREAK: self.short_break_min, LONG_BREAK: self.long_break_min}
+        return minutes[self.phase] * 60
+
+    def elapsed_at(self, now):
+        if self.running:
+            return self.elapsed + (now - self.running_since)
+        return self.elapsed
+
+    def deadline(self):
+        """Monotonic time the current phase ends, None for stopwatches or paused timers"""
+        if self.kind != POMODORO or not self.running:
+            return None
+        return self.running_since + (self.phase_length() - self.elapsed)
+
+    def display(self, now):
+        if self.kind == POMODORO:
+            return format_seconds(self.phase_length() - self.elapsed_at(now))
+        return format_seconds(self.elapsed_at(now))
+
+    def start(self, now):
+        if not self.running:
+            self.running_since = now
+            self.generation += 1
+
+    def pause(self, now):
+        if self.running:
+            self.elapsed = self.elapsed_at(now)
+            self.running_since = None
+            self.generation += 1
+
+    def reset(self):
+        self.reps = 1
+        self.elapsed = 0.0
+        self.running_since = None
+        self.generation += 1
+
+    def advance(self, deadline):
+        """Move to the next pomodoro phase; the new phase starts exactly at the old deadline"""
+        self.reps = 1 if self.phase == LONG_BREAK else self.reps + 1
+        self.elapsed = 0.0
+        self.running_since = deadline
+        self.generation += 1
+
+
+class TimerScheduler:
+    """Drives every NamedTimer from one heap and one Tk `after` handle"""
+
+    def __init__(self, root, path=None, clock=time.monotonic):
+        self.root = root
+        self.path = path
+        self.clock = clock
+        self.timers = {}
+        self.focused = None
+        self.wakeups = 0
+        self._heap = []             # (deadline, seq, name or None, generation)
+        self._seq = itertools.count()
+        self._after_id = None
+        self._armed_deadline = None
+        self._display_generation = 0
+        self._display_listeners = []
+        self._phase_listeners = []
+
+    # ------------------------------ TIMERS ------------------------------ #
+    def add(self, name, kind=STOPWATCH, **minutes):
+        if not name or name in self.timers:
+            raise ValueError(f"Timer name must be unique and not empty: {name!r}")
+        self.timers[name] = NamedTimer(name, kind, **minutes)
+        self._changed()
+        return self.timers[name]
+
+    def remove(self, name):
+        self.timers.pop(name, None)  # Its heap entries become stale and are skipped
+        if self.focused == name:
+            self.focused = None
+        self._changed()
+
+    def start(self, name):
+        timer = self.timers[name]
+        timer.start(self.clock())
+        self._push(timer)
+        self._changed()
+
+    def pause(self, name):
+        self.timers[name].pause(self.clock())
+        self._changed()
+
+    def toggle(self, name):
+        if self.timers[name].running:
+            self.pause(name)
+        else:
+            self.start(name)
+
+    def reset(self, name):
+        self.timers[name].reset()
+        self._changed()
+
+    def focus(self, name):
+        """Show `name` on the floating window (None to clear)"""
+        self.focused = name if name in self.timers else None
+        self._changed()
+
+    def focused_text(self):
+        timer = self.timers.get(self.focused)
+        if timer is None:
+            return ""
+        return f"{timer.name} {timer.display(self.clock())}"
+
+    # ------------------------------ LISTENERS ------------------------------ #
+    def on_display(self, callback):
+        """callback(scheduler) about once a second while any timer runs"""
+        self._display_listeners.append(callback)
+
+    def on_phase(self, callback):
+        """callback(timer) when a pomodoro timer moves to its next phase"""
+        self._phase_listeners.append(callback)
+
+    # ------------------------------ HEAP ------------------------------ #
+    def _push(self, timer):
+        deadline = timer.deadline()
+        if deadline is not None:
+            heapq.heappush(self._heap, (deadline, next(self._seq), timer.name, timer.generation))
+
+    def _valid(self, entry):
+        _, _, name, generation = entry
+        if name is None:
+            return generation == self._display_generation
+        timer = self.timers.get(name)
+        return timer is not None and timer.running and timer.generation == generation
+
+    def _schedule_display(self, now):
+        self._display_generation += 1
+        if self._display_listeners and any(timer.running for timer in self.timers.values()):
+            heapq.heappush(self._heap, (now + DISPLAY_INTERVAL, next(self._seq), None, self._display_generation))
+
+    def _changed(self):
+        now = self.clock()
+        self._notify()
+        self._schedule_display(now)
+        self._arm()
+        self.save()
+
+    def _notify(self):
+        for callback in self._display_listeners:
+            callback(self)
+
+    def _arm(self):
+        """Point the single `after` handle at the earliest live deadline"""
+        while self._heap and not self._valid(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._cancel()
+            return
+        deadline = self._heap[0][0]
+        if self._after_id is not None and self._armed_deadline <= deadline:
+            return
+        self._cancel()
+        delay_ms = max(int((deadline - self.clock()) * 1000), 0)
+        self._armed_deadline = deadline
+        self._after_id = self.root.after(delay_ms, self._wake)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = None
+        self._armed_deadline = None
+
+    def _wake(self):
+        self._after_id = None
+        self._armed_deadline = None
+        self.wakeups += 1
+        now = self.clock()
+        display_due = False
+        advanced = False
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._valid(entry):
+                continue
+            if entry[2] is None:
+                display_due = True
+                continue
+            timer = self.timers[entry[2]]
+            timer.advance(entry[0])
+            self._push(timer)
+            advanced = True
+            for callback in self._phase_listeners:
+                callback(timer)
+        if display_due or advanced:
+            self._notify()
+            self._schedule_display(now)
+        if advanced:
+            self.save()
+        self._arm()
+
+    # ------------------------------ PERSISTENCE ------------------------------ #
+    def save(self):
+        """Write every timer's state (paused snapshot) to the timers csv"""
+        if self.path is None:
+            return
+        now = self.clock()
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", newline='', encoding="utf-8") as file:
+                writer = csv.DictWriter(file, fieldnames=TIMER_FIELDS)
+                writer.writeheader()
+                for timer in self.timers.values():
+                    writer.writerow({
+                        "name": timer.name,
+                        "kind": timer.kind,
+                        "reps": timer.reps,
+                        "elapsed": round(timer.elapsed_at(now), 3),
+                        "work_min": timer.work_min,
+                        "short_break_min": timer.short_break_min,
+                        "long_break_min": timer.long_break_min,
+                        "focused": timer.name == self.focused,
+                    })
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error: Could not save timers: {e}")
+
+    def load(self):
+        """Restore timers from the csv; they come back paused, like the main timer"""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", newline='', encoding="utf-8") as file:
+                for row in csv.DictReader(file):
+                    timer = NamedTimer(row["name"], row["kind"], int(row["work_min"]),
+                                       int(row["short_break_min"]), int(row["long_break_min"]))
+                    timer.reps = int(row["reps"])
+                    timer.elapsed = float(row["elapsed"])
+                    self.timers[timer.name] = timer
+                    if row.get("focused") == "True":
+                        self.focused = timer.name
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Error: Could not load timers: {e}")